@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Platinum-tool.
+
+Runs fixed workloads offline against the builtin ephemeris:
+
+- heliocentric longitudes for one body (`get_heliocentric_longitudes_vectorized`)
+- `calculate_longitudes_and_synodic_angles` with 2 and 8 bodies at several steps
+- `calculate_synodic_period` with a cold and a warm longitude store
+- `Calculations.calculate_time_difference` throughput (scalar and vectorized)
+- CLI import time (see startup.py)
+
+Each workload is timed as the best of `--repeat` runs. Results are written as
+JSON to `--output`, and compared with the baseline file: a benchmark fails if it
+is slower than its baseline by more than `--threshold` (relative) and
+`--min-delta` (absolute seconds). If no baseline exists yet, or with
+`--update-baseline`, the results become the new baseline.
+
+Usage:
+    python benchmarks/run.py [--repeat 3] [--threshold 0.25] [--only synodic]
+"""
+import argparse
+import atexit
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+PLANETS = ['mercury', 'venus', 'earth', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune']
+START, END = "2000-01-01", "2010-01-01"
+
+
+def _ephemeris(store_dir=None):
+    from astro import Ephemeris
+    from longitude_store import LongitudeStore
+    eph = Ephemeris()
+    # Keep runs hermetic: never read or grow the shared cache directory
+    if store_dir is None:
+        store_dir = tempfile.mkdtemp(prefix="platinum-bench-")
+        atexit.register(shutil.rmtree, store_dir, True)
+    eph.longitude_store = LongitudeStore(store_dir)
+    return eph
+
+
+def bench_longitudes_vectorized():
+    import pandas as pd
+    eph = _ephemeris()
+    dates = pd.date_range(START, END, freq="1D")
+    return lambda: eph.get_heliocentric_longitudes_vectorized(dates, "mars")
+
+
+def bench_synodic_angles(n_bodies, step):
+    def setup():
+        eph = _ephemeris()
+        return lambda: eph.calculate_longitudes_and_synodic_angles(START, END, PLANETS[:n_bodies], step=step)
+    return setup
+
+
+def bench_synodic_period_cold():
+    def run():
+        eph = _ephemeris()
+        eph.calculate_synodic_period(START, END, "mars", "venus", step=1)
+    return run
+
+
+def bench_synodic_period_warm():
+    eph = _ephemeris()
+    eph.calculate_synodic_period(START, END, "mars", "venus", step=1)
+    return lambda: eph.calculate_synodic_period(START, END, "mars", "venus", step=1)
+
+
+def _date_pairs(n):
+    import numpy as np
+    rng = np.random.default_rng(0)
+    base = np.datetime64("1950-01-01T00:00", "us")
+    starts = base + rng.integers(0, 80 * 365 * 86400, n).astype("timedelta64[s]")
+    ends = base + rng.integers(0, 80 * 365 * 86400, n).astype("timedelta64[s]")
+    return starts, ends
+
+
+def bench_time_difference_scalar():
+    from calculations import Calculations
+    starts, ends = _date_pairs(10000)
+    pairs = list(zip(starts.astype(datetime), ends.astype(datetime)))
+
+    def run():
+        for start, end in pairs:
+            Calculations.calculate_time_difference(start, end, "years")
+    return run
+
+
+def bench_time_difference_vectorized():
+    from calculations import Calculations
+    starts, ends = _date_pairs(100000)
+    return lambda: Calculations.calculate_time_differences(starts, ends)
+
+
+# Name -> setup function returning the callable to time
+BENCHMARKS = {
+    "longitudes_vectorized_mars_10y_1d": bench_longitudes_vectorized,
+    "synodic_angles_2bodies_10y_1d": bench_synodic_angles(2, 1),
+    "synodic_angles_2bodies_10y_7d": bench_synodic_angles(2, 7),
+    "synodic_angles_2bodies_10y_30d": bench_synodic_angles(2, 30),
+    "synodic_angles_8bodies_10y_1d": bench_synodic_angles(8, 1),
+    "synodic_angles_8bodies_10y_7d": bench_synodic_angles(8, 7),
+    "synodic_angles_8bodies_10y_30d": bench_synodic_angles(8, 30),
+    "synodic_period_cold_10y_1d": bench_synodic_period_cold,
+    "synodic_period_warm_10y_1d": bench_synodic_period_warm,
+    "time_difference_scalar_10k": bench_time_difference_scalar,
+    "time_difference_vectorized_100k": bench_time_difference_vectorized,
+}
+
+
+def time_best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(names, repeat: int) -> dict:
+    """Time the named benchmarks; returns name -> seconds."""
+    results = {}
+    for name in names:
+        if name == "cli_import":
+            from startup import measure
+            results[name] = measure(repeat * 3)["import_ms"] / 1000.0
+        else:
+            func = BENCHMARKS[name]()
+            func()  # warm-up: astropy and NumPy set-up costs are not part of the workload
+            results[name] = time_best(func, repeat)
+        print(f"{name:40s} {results[name] * 1000:10.1f} ms", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list:
+    """Names of benchmarks that regressed against the baseline."""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if seconds > reference * (1 + threshold) and seconds - reference > min_delta:
+            print(f"REGRESSION {name}: {seconds * 1000:.1f} ms vs baseline {reference * 1000:.1f} ms")
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best is kept)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (default 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="Ignore slowdowns smaller than this many seconds (default 0.005)")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--output", type=Path, help="Write this run's results to a JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    names = list(BENCHMARKS) + ["cli_import"]
+    if args.only:
+        names = [name for name in names if args.only in name]
+
+    results = run(names, args.repeat)
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else None
+    if baseline is None or args.update_baseline:
+        if baseline is not None:
+            report["results"] = {**baseline, **results}
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    return 1 if compare(results, baseline, args.threshold, args.min_delta) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
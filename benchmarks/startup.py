@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the CLI.
+
+Measures how long `import cli` takes in a fresh interpreter (median of several
+runs, minus the cost of starting an empty interpreter) and checks that none of
+the heavy astro modules are imported at startup. Exits with status 1 if the
+import time exceeds the budget or a heavy module is loaded.
+
+Usage:
+    python benchmarks/startup.py [--repeats 10] [--max-ms 250]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Modules that must only be loaded once the astro or time menus are used
+DEFERRED_MODULES = ["astropy", "pandas", "numpy", "dateutil", "astro", "calculations"]
+
+
+def time_command(code: str, repeats: int) -> float:
+    """Median wall time (seconds) of running `code` in a fresh interpreter."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def loaded_deferred_modules() -> list:
+    """Deferred modules that are present in sys.modules right after `import cli`."""
+    code = (
+        "import json, sys, cli; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def measure(repeats: int = 10) -> dict:
+    """Import time of the CLI in milliseconds, and any deferred modules it loaded."""
+    baseline = time_command("pass", repeats)
+    total = time_command("import cli", repeats)
+    return {
+        "import_ms": max(0.0, (total - baseline) * 1000.0),
+        "loaded_deferred_modules": loaded_deferred_modules(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=10, help="Runs per measurement (median is used)")
+    parser.add_argument("--max-ms", type=float, default=250.0, help="Import time budget in milliseconds")
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeats)
+    print(f"CLI import time: {result['import_ms']:.1f} ms (budget {args.max_ms:.0f} ms)")
+    failed = False
+    if result["loaded_deferred_modules"]:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(result['loaded_deferred_modules'])}")
+        failed = True
+    if result["import_ms"] > args.max_ms:
+        print("FAIL: import time regressed beyond the budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
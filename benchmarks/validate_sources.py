@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Regenerate the ephemeris source validation table (src/source_accuracy.json).
+
+For every body and epoch range (50-year ranges over 1800-2200 by default),
+each tier is sampled at `--samples` random dates and its largest heliocentric
+longitude error in arcseconds is recorded, with a safety margin for the peaks
+random sampling can miss:
+
+- builtin and chebyshev are compared with de440 when the kernel is present
+  at src/de440.bsp;
+- without the kernel, builtin keeps its existing documented bounds and
+  chebyshev is compared with builtin, its fit source, plus builtin's bound;
+  those rows are labelled as such and only cover the documented ranges.
+
+Runs offline and never touches the shared cache directory.
+
+Usage:
+    python benchmarks/validate_sources.py [--samples 500] [--output src/source_accuracy.json]
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import warnings
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from astro import Ephemeris  # noqa: E402
+from chebyshev import ChebyshevStore, utc_to_tt  # noqa: E402
+import sources  # noqa: E402
+
+PLANETS = ['mercury', 'venus', 'earth', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune']
+# Measured maxima are scaled by this to cover peaks between the sampled dates
+MARGIN = 1.25
+
+
+def epoch_ranges(start: str, end: str, years: int):
+    """(start, end) date strings of consecutive `years`-long ranges."""
+    first, last = int(start[:4]), int(end[:4])
+    return [(f"{year}-01-01", f"{min(year + years, last)}-01-01") for year in range(first, last, years)]
+
+
+def sample_dates(start: str, end: str, samples: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.uniform(sources.date_to_jd(start), sources.date_to_jd(end), samples))
+
+
+def angular_error(values: np.ndarray, reference: np.ndarray) -> float:
+    """Largest absolute longitude difference in arcseconds."""
+    return float(np.abs((values - reference + 180.0) % 360.0 - 180.0).max() * 3600.0)
+
+
+def entry(start: str, end: str, error: float, method: str) -> dict:
+    return {"start": start, "end": end, "max_error_arcsec": round(error, 4), "method": method}
+
+
+def kernel_coverage(eph: Ephemeris):
+    """(start, end) dates covered by every segment of the local kernel."""
+    segments = [s for targets in eph.kernel.segments.values() for s in targets]
+    first = max(s.start_et for s in segments) / 86400.0 + 2451545.0
+    last = min(s.end_et for s in segments) / 86400.0 + 2451545.0
+    # Whole days inside the coverage; day-precision dates avoid the 1677-2262 limit of datetime64[ns]
+    return [sources.jd_to_date(first + 1.0), sources.jd_to_date(last - 1.0)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=sources.ACCURACY_TABLE)
+    parser.add_argument("--samples", type=int, default=500, help="Random dates per body and range")
+    parser.add_argument("--start", default="1800-01-01")
+    parser.add_argument("--end", default="2200-01-01")
+    parser.add_argument("--years", type=int, default=50, help="Length of each epoch range")
+    parser.add_argument("--bodies", default=",".join(PLANETS))
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")
+
+    bodies = [b.strip().lower() for b in args.bodies.split(",") if b.strip()]
+    ranges = epoch_ranges(args.start, args.end, args.years)
+    with open(sources.ACCURACY_TABLE) as f:
+        data = json.load(f)
+    tiers = data["tiers"]
+    previous = sources.load_accuracy_table()
+
+    cache_dir = tempfile.mkdtemp(prefix="platinum-validate-")
+    try:
+        eph = Ephemeris(cache_dir=cache_dir)
+        have_kernel = eph.kernel is not None
+        store = ChebyshevStore(eph, start=args.start, end=args.end)
+        if have_kernel:
+            kernel_start, kernel_end = kernel_coverage(eph)
+            tiers["de440"] = {body: [{"start": kernel_start, "end": kernel_end, "max_error_arcsec": 0.0,
+                                      "method": "reference"}] for body in bodies}
+        else:
+            print("No src/de440.bsp: keeping the builtin entries, validating chebyshev against builtin")
+
+        for body in bodies:
+            builtin_entries, chebyshev_entries = [], []
+            for n, (start, end) in enumerate(ranges):
+                if have_kernel and not (kernel_start <= start and end <= kernel_end):
+                    continue
+                jd = sample_dates(start, end, args.samples, seed=n)
+                fitted = store.series(body).longitudes(utc_to_tt(jd))
+                if have_kernel:
+                    reference = eph.get_heliocentric_longitudes_jd(jd, body, source='de440')
+                    builtin = eph.get_heliocentric_longitudes_jd(jd, body, source='builtin')
+                    builtin_entries.append(entry(start, end, angular_error(builtin, reference) * MARGIN, "measured"))
+                    chebyshev_entries.append(entry(start, end, angular_error(fitted, reference) * MARGIN, "measured"))
+                else:
+                    base = sources.max_error(previous, "builtin", body,
+                                             sources.date_to_jd(start), sources.date_to_jd(end))
+                    if base is None:
+                        continue
+                    builtin = eph.get_heliocentric_longitudes_jd(jd, body, source='builtin')
+                    fit = angular_error(fitted, builtin) * MARGIN
+                    chebyshev_entries.append(entry(start, end, base + fit, "documented builtin bound + measured fit"))
+                print(f"{body:8s} {start} - {end}: chebyshev {chebyshev_entries[-1]['max_error_arcsec']:.4f}\"")
+            if have_kernel:
+                tiers["builtin"][body] = builtin_entries
+            if chebyshev_entries:
+                tiers["chebyshev"][body] = chebyshev_entries
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    data.update(reference="de440", generated=date.today().isoformat(), samples=args.samples)
+    data["tiers"] = {tier: tiers.get(tier, {}) for tier in sources.TIERS}
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    print(f"Validation table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,4 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from cli import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
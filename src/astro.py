@@ -6,111 +6,626 @@ Script to calculate the celestial positions of planets
 import pandas as pd
 import numpy as np
 from astropy.time import Time
-from astropy.coordinates import get_body_barycentric, solar_system_ephemeris, SphericalRepresentation
+from astropy.coordinates import (
+    get_body_barycentric, solar_system_ephemeris, SphericalRepresentation, CartesianRepresentation
+)
 from astropy import units as u
 from typing import Optional
 import logging
+import os
+import threading
 import warnings
-import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from functools import partial
 from pathlib import Path
-from joblib import Memory
+import adaptive
+from chebyshev import ChebyshevStore, julian_date_range, to_julian_date, from_julian_date
+import frames
+import sources
+from instrument import profiler
+from cache import CacheManager
+from memo import LRUCache
+from spk import SPKKernel, open_kernel, julian_date_to_et
+from longitude_store import LongitudeStore
+from streaming import ChunkSink
+from synodic import SynodicTable
 
-# Define a logger for the module
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Define a logger for the module; handlers are configured by the application (see cli.main)
 logger = logging.getLogger(__name__)
 
+# Per-process Ephemeris used by pool workers (see `_init_worker`)
+_worker_ephemeris = None
+# Pool workers keep kernel sources loaded as the process default once used
+_keep_kernels = False
+# astropy's default ephemeris is process-global; threads switching it take turns
+_source_lock = threading.RLock()
+
+
+@contextmanager
+def _source_context(source: str):
+    """
+    Context for computing with an ephemeris source.
+    The builtin source needs no global state; kernel sources are set as the
+    default so astropy keeps the kernel open while it stays the default, and
+    the switch is held under a lock so concurrent threads never compute with
+    each other's source. In pool workers the kernel is left as the default
+    afterwards, so it is loaded only once per process.
+    """
+    if source == 'builtin':
+        yield
+        return
+    with _source_lock:
+        if _keep_kernels:
+            solar_system_ephemeris.set(source)
+            yield
+        else:
+            with solar_system_ephemeris.set(source):
+                yield
+
+
+def _to_time(value, **kwargs) -> Time:
+    """
+    Build a Time. While profiling, it is also converted to TDB up front; astropy
+    caches the conversion, so the ephemeris evaluation that follows reuses it and
+    the profile can attribute the two stages separately.
+    """
+    with profiler.stage("time_conversion"):
+        times = Time(value, **kwargs)
+        if profiler.enabled:
+            times.tdb
+        return times
+
+
+def _barycentric(body: str, times: Time, source: str):
+    """
+    Barycentric position of a body. The builtin source is passed explicitly rather
+    than set globally, which would make astropy close any loaded kernel.
+    """
+    with profiler.stage(f"ephemeris_eval_{source}"):
+        return get_body_barycentric(body, times, ephemeris='builtin' if source == 'builtin' else None)
+
+
+def _init_worker(use_chebyshev: bool, cache_dir: Optional[str] = None):
+    """
+    Pool initializer: build one Ephemeris per worker process, reused for every chunk.
+    """
+    global _worker_ephemeris, _keep_kernels
+    _worker_ephemeris = Ephemeris(use_chebyshev=use_chebyshev, cache_dir=cache_dir)
+    _keep_kernels = True
+
+
+def _worker_longitudes(dates, bodies: list, frame: str = "icrs", accuracy: Optional[float] = None) -> np.ndarray:
+    """
+    Compute one chunk of the longitude batch in a pool worker.
+    """
+    return _worker_ephemeris.get_heliocentric_longitudes_batch(dates, bodies, frame=frame, accuracy=accuracy)
+
+
 class Ephemeris:
-    def __init__(self):
+    def __init__(
+            self,
+            use_chebyshev: bool = False,
+            memo_size: int = 4096,
+            memo_policy: str = "lru",
+            memo_disk: bool = False,
+            cache_dir: Optional[str] = None,
+            cache_max_bytes: Optional[int] = None
+    ):
         self.base_dir = Path(__file__).resolve().parent
-        self.cache_dir = self.base_dir / "cache"
-        self.cache_dir.mkdir(exist_ok=True)
-        self.memory = Memory(self.cache_dir, verbose=0)
+        # Shared, size-capped cache directory (see cache.py); by default outside the package
+        self.cache = CacheManager(cache_dir, cache_max_bytes)
+        self.cache_dir = self.cache.root
+        self.longitude_memo = LRUCache(
+            maxsize=memo_size,
+            policy=memo_policy,
+            disk_path=self.cache_dir / "memo" / "longitudes" if memo_disk else None
+        )
         self.ephemeris_path = str(self.base_dir / 'de440.bsp')
+        self.use_chebyshev = use_chebyshev
+        self._chebyshev = None
+        # Accuracy-tiered source choice, and the sources known to fail per body and epoch
+        self.sources = sources.SourceSelector()
+        self.longitude_store = LongitudeStore(
+            self.cache_dir / "longitudes" / ("chebyshev" if use_chebyshev else "reference"),
+            cache=self.cache
+        )
 
-    def _cached_heliocentric_longitudes(self, time: Time, body: str) -> Optional[float]:
+    @property
+    def chebyshev(self) -> ChebyshevStore:
         """
-        Calculates heliocentric longitude for a planet from a given start date.
-        Tries builtin first (lightest), then 'de440' if needed.
+        Lazily created Chebyshev coefficient store backed by this instance.
         """
-        ephemeris_sources = ['builtin', 'de440']
-        for i, source in enumerate(ephemeris_sources):
-            try:
-                with solar_system_ephemeris.set(source):
-                    t = Time(time)
-                    pos = get_body_barycentric(body, t) - get_body_barycentric('sun', t)
-                    return SphericalRepresentation.from_cartesian(pos).lon.to(u.deg).value
-            except Exception as e:
-                if i < len(ephemeris_sources) - 1:
-                    logger.warning(f"Failed with {source} for {body} on {time} due to {e}. Trying next fallback.")
-                else:
-                    logger.error(f"Failed to get longitudes for {body} with all sources.")
-                    raise
+        if self._chebyshev is None:
+            self._chebyshev = ChebyshevStore(self)
+        return self._chebyshev
 
-    # Add caching to the instance method
-    _cached_heliocentric_longitudes = property(lambda self: self.memory.cache(self._cached_heliocentric_longitudes))
-    
-    def get_heliocentric_longitude(self, time: Time, body: str) -> Optional[float]:
+    @property
+    def kernel(self) -> Optional[SPKKernel]:
+        """
+        Process-wide memory-mapped reader for the local de440.bsp, or None if the file is absent.
+        """
+        if not os.path.exists(self.ephemeris_path):
+            return None
+        return open_kernel(self.ephemeris_path)
+
+    def _source_context(self, source: str):
+        """
+        Like `_source_context`, but the local kernel is read directly and needs no global state.
+        """
+        if source == 'de440' and self.kernel is not None:
+            return nullcontext()
+        return _source_context(source)
+
+    def _barycentric(self, body: str, times: Time, source: str):
         """
-        Get heliocentric longitude for a given date and body
+        Barycentric position of a body. The de440 source is evaluated from the local
+        kernel when it exists, otherwise through astropy.
+        """
+        kernel = self.kernel if source == 'de440' else None
+        if kernel is None:
+            return _barycentric(body, times, source)
+        with profiler.stage("ephemeris_eval_de440"):
+            tdb = times.tdb
+            return CartesianRepresentation(kernel.body_barycentric(body, julian_date_to_et(tdb.jd1, tdb.jd2)) * u.km)
+
+    def _heliocentric_longitude(self, jd: float, body: str, frame: str = "icrs") -> float:
+        """
+        Calculates heliocentric longitude for a planet at a single UTC Julian date.
+        Uses the Chebyshev store if enabled, otherwise tries builtin first (lightest), then 'de440'.
+        """
+        if self.use_chebyshev:
+            return float(self.chebyshev.longitudes(Time(jd, format='jd', scale='utc'), body, frame=frame)[0])
+        return float(self.get_heliocentric_longitudes_jd(np.array([jd]), body, frame=frame)[0])
+
+    def get_heliocentric_longitude(self, time, body: str, frame: str = "icrs") -> Optional[float]:
+        """
+        Get heliocentric longitude for a given date and body in `frame` (see frames.FRAMES).
+        Results are memoized in memory per (body, Julian date, source, frame).
         """
         try:
-            logger.debug(f"Calculating longitude for {body} on {time}")
-            return self._cached_heliocentric_longitudes(time, body)
+            jd = float(to_julian_date(time)[0])
+            source = "chebyshev" if self.use_chebyshev else "reference"
+            logger.debug("Calculating longitude for %s on %s", body, time)
+            profiler.count("memo_lookups")
+            return self.longitude_memo.get_or_compute(
+                (body, jd, source, frame), partial(self._memo_miss, jd, body, frame)
+            )
         except Exception:
             return None
 
-    def get_heliocentric_longitudes_vectorized(self, dates, body: str):
+    def _memo_miss(self, jd: float, body: str, frame: str) -> float:
+        profiler.count("memo_misses")
+        return self._heliocentric_longitude(jd, body, frame)
+
+    def memo_stats(self) -> dict:
         """
-        Calculates heliocentric longitudes for a planet for an array of dates.
-        Tries builtin first, then 'de440'.
+        Hit, miss and eviction counters of the single-date longitude memo.
         """
-        ephemeris_sources = ['builtin', 'de440']
+        return self.longitude_memo.stats()
+
+    def _longitudes(self, pos, times: Time, frame: str) -> np.ndarray:
+        """
+        Longitudes in degrees of heliocentric positions in `frame`. ICRS longitudes come
+        straight from the vectors; ecliptic ones use rotation matrices cached per date grid.
+        """
+        if frame == "icrs":
+            return SphericalRepresentation.from_cartesian(pos).lon.to(u.deg).value
+        with profiler.stage("frame_rotation"):
+            return frames.longitudes(pos.xyz.value, frames.rotation_matrices(frame, times))
+
+    def _tiers(self, accuracy: Optional[float]) -> tuple:
+        """
+        Ephemeris tiers to consider, cheapest first. The Chebyshev tier is only
+        offered for accuracy-driven selection, and only when it is enabled.
+        """
+        if accuracy is not None and self.use_chebyshev:
+            return sources.TIERS
+        return sources.DEFAULT_SOURCES
+
+    def get_heliocentric_longitudes_vectorized(
+            self,
+            dates,
+            body: str,
+            frame: str = "icrs",
+            accuracy: Optional[float] = None
+    ):
+        """
+        Calculates heliocentric longitudes for a planet for an array of dates, in `frame`
+        ('icrs', 'ecliptic_j2000' or 'ecliptic_date'; see frames.py).
+        Tries builtin first, then 'de440'. With `accuracy` (arcseconds), the cheapest
+        source validated to that accuracy over the dates is used (see sources.py).
+        Sources that failed for the body and epoch before are not tried again.
+        """
+        frames.check_frame(frame)
+        jd = to_julian_date(dates)
+        ephemeris_sources = self.sources.candidates(body, jd, accuracy, self._tiers(accuracy))
+        if not ephemeris_sources:
+            raise ValueError(f"Every ephemeris source is known to fail for {body} over these dates")
         for i, source in enumerate(ephemeris_sources):
             try:
-                with solar_system_ephemeris.set(source):
-                    times = Time(dates)
-                    pos = get_body_barycentric(body, times) - get_body_barycentric('sun', times)
-                    return SphericalRepresentation.from_cartesian(pos).lon.to(u.deg).value
+                if source == 'chebyshev':
+                    result = self.get_heliocentric_longitudes_fast(dates, body, frame=frame)
+                else:
+                    with self._source_context(source):
+                        times = _to_time(dates)
+                        pos = self._barycentric(body, times, source) - self._barycentric('sun', times, source)
+                        result = self._longitudes(pos, times, frame)
             except Exception as e:
+                self.sources.record_failure(source, body, jd)
                 if i < len(ephemeris_sources) - 1:
-                    logger.warning(f"Vectorized calculation failed with {source} for {body} due to {e}. Trying next fallback.")
+                    profiler.count("source_fallbacks")
+                    logger.warning("Vectorized calculation failed with %s for %s due to %s. Trying next fallback.", source, body, e)
                 else:
-                    logger.error(f"Failed to get longitudes for {body} with all sources.")
+                    logger.error("Failed to get longitudes for %s with all sources.", body)
                     raise
+            else:
+                self.sources.record_success(source, body, jd, accuracy)
+                return result
     
-    def calculate_longitudes_and_synodic_angles(self, start: str, end: str, bodies: list, step: float = 7) -> pd.DataFrame:
+    def get_heliocentric_positions(self, jd, body: str, source: Optional[str] = None,
+                                   scale: str = 'utc') -> np.ndarray:
         """
-        Calculate heliocentric longitudes for a list of bodies and synodic angles between each pair over a time period.
-        Returns a DataFrame with columns for each body's longitude and each pair's synodic angle.
+        Heliocentric Cartesian position (AU, ICRS axes) of a body for Julian dates in
+        time scale `scale` (UTC by default). Returns an array of shape (3, n). Uses
+        `source` if given, otherwise tries builtin first, then 'de440'.
         """
-        dates = pd.date_range(start=start, end=end, freq=f'{step}D')
-        if dates.empty or not bodies:
-            return pd.DataFrame()
+        ephemeris_sources = [source] if source else ['builtin', 'de440']
+        for i, source in enumerate(ephemeris_sources):
+            try:
+                with self._source_context(source):
+                    times = _to_time(np.asarray(jd, dtype=float), format='jd', scale=scale)
+                    pos = self._barycentric(body, times, source) - self._barycentric('sun', times, source)
+                    return pos.xyz.to(u.au).value
+            except Exception as e:
+                if i < len(ephemeris_sources) - 1:
+                    profiler.count("source_fallbacks")
+                    logger.warning("Position calculation failed with %s for %s due to %s. Trying next fallback.", source, body, e)
+                else:
+                    logger.error("Failed to get positions for %s with all sources.", body)
+                    raise
 
-        # Calculate longitudes for all bodies
-        longitudes = {}
-        for body in bodies:
+    def get_heliocentric_longitudes_jd(
+            self,
+            jd,
+            body: str,
+            source: Optional[str] = None,
+            frame: str = "icrs"
+    ) -> np.ndarray:
+        """
+        Heliocentric longitudes in degrees for UTC Julian dates via the astropy reference path.
+        """
+        xyz = self.get_heliocentric_positions(jd, body, source=source)
+        return frames.longitudes(xyz, frames.rotation_matrices_jd(frame, jd))
+
+    def get_heliocentric_longitudes_fast(self, dates, body: str, frame: str = "icrs") -> np.ndarray:
+        """
+        Heliocentric longitudes from the Chebyshev store, evaluated with NumPy only.
+        Dates outside the store range fall back to the astropy reference path.
+        """
+        return self.chebyshev.longitudes(dates, body, frame=frame)
+
+    def get_heliocentric_longitudes_batch(
+            self,
+            dates,
+            bodies: list,
+            strict: bool = False,
+            frame: str = "icrs",
+            accuracy: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Calculates heliocentric longitudes for several bodies over one date grid, in `frame`.
+        The time conversion, the Sun's barycentric position and any frame rotation are
+        computed once per ephemeris source and shared by every body.
+        Returns an array of shape (n_dates, n_bodies). Bodies that fail with all sources
+        are filled with NaN, or the last error is raised if `strict` is set.
+        With `accuracy` (arcseconds), each body only uses sources validated to that
+        accuracy, cheapest first (see `get_heliocentric_longitudes_vectorized`).
+        """
+        frames.check_frame(frame)
+        result = np.full((len(dates), len(bodies)), np.nan)
+        if self.use_chebyshev and accuracy is None:
+            for j, body in enumerate(bodies):
+                try:
+                    result[:, j] = self.get_heliocentric_longitudes_fast(dates, body, frame=frame)
+                except Exception as e:
+                    if strict:
+                        raise
+                    logger.warning("Failed to get longitude for %s: %s", body, e)
+            return result
+
+        jd = to_julian_date(dates)
+        tiers = self._tiers(accuracy)
+        candidates = [self.sources.candidates(body, jd, accuracy, tiers) for body in bodies]
+        pending = list(range(len(bodies)))
+        last_error = None
+        for source in tiers:
+            current = [j for j in pending if source in candidates[j]]
+            if not current:
+                continue
+            failed = []
             try:
-                longitudes[body] = self.get_heliocentric_longitudes_vectorized(dates, body)
+                if source == 'chebyshev':
+                    for j in current:
+                        try:
+                            result[:, j] = self.get_heliocentric_longitudes_fast(dates, bodies[j], frame=frame)
+                        except Exception as e:
+                            failed.append(j)
+                            last_error = e
+                else:
+                    with self._source_context(source):
+                        times = _to_time(dates)
+                        sun = self._barycentric('sun', times, source)
+                        for j in current:
+                            try:
+                                pos = self._barycentric(bodies[j], times, source) - sun
+                                result[:, j] = self._longitudes(pos, times, frame)
+                            except Exception as e:
+                                failed.append(j)
+                                last_error = e
             except Exception as e:
-                logger.warning(f"Failed to get longitude for {body}: {e}")
-                longitudes[body] = np.full(len(dates), np.nan)
+                failed = current
+                last_error = e
+            for j in current:
+                if j in failed:
+                    self.sources.record_failure(source, bodies[j], jd)
+                else:
+                    self.sources.record_success(source, bodies[j], jd, accuracy)
+            pending = [j for j in pending if j not in current or j in failed]
+            if not pending:
+                break
+            if failed:
+                profiler.count("source_fallbacks", len(failed))
+                logger.warning("Batch calculation failed with %s for %s due to %s.", source, [bodies[j] for j in failed], last_error)
+        if pending:
+            names = [bodies[j] for j in pending]
+            logger.error("Failed to get longitudes for %s with all sources.", names)
+            if strict:
+                raise last_error or ValueError(f"Every ephemeris source is known to fail for {names} over these dates")
+        return result
 
-        df = pd.DataFrame(longitudes, index=dates)
-        df.dropna(inplace=True)
-        if df.empty:
-            return pd.DataFrame()
+    def get_heliocentric_longitudes_parallel(
+            self,
+            dates,
+            bodies: list,
+            workers: Optional[int] = None,
+            chunk_size: Optional[int] = None,
+            frame: str = "icrs",
+            accuracy: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Calculates the longitude batch in a process pool.
+        The dates are split into chunks of `chunk_size` (by default about four chunks per
+        worker), computed by `workers` processes and stitched back together in order.
+        The result is identical to `get_heliocentric_longitudes_batch`.
+        """
+        workers = workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(dates) // (workers * 4)))
+        chunks = [dates[i:i + chunk_size] for i in range(0, len(dates), chunk_size)]
+        if workers == 1 or len(chunks) <= 1:
+            return self.get_heliocentric_longitudes_batch(dates, bodies, frame=frame, accuracy=accuracy)
 
-        # Calculate synodic angles for each unique pair
-        from itertools import combinations
-        for body1, body2 in combinations(bodies, 2):
-            angle_diff = np.abs((df[body2] - df[body1]) % 360)
-            synodic_angle = np.minimum(angle_diff, 360 - angle_diff)
-            col_name = f"{body2}-{body1}_synodic"
-            df[col_name] = synodic_angle
+        with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                initializer=_init_worker,
+                initargs=(self.use_chebyshev, str(self.cache_dir))
+        ) as pool:
+            results = list(pool.map(
+                _worker_longitudes, chunks, [bodies] * len(chunks), [frame] * len(chunks), [accuracy] * len(chunks)
+            ))
+        return np.concatenate(results)
 
-        return df
+    def calculate_synodic_table(
+            self,
+            start: str,
+            end: str,
+            bodies: list,
+            step: float = 7,
+            dtype=np.float64,
+            workers: Optional[int] = None,
+            chunk_size: Optional[int] = None,
+            frame: str = "icrs",
+            tolerance: Optional[float] = None,
+            julian_dates: bool = False,
+            accuracy: Optional[float] = None
+    ) -> SynodicTable:
+        """
+        Calculate heliocentric longitudes and pairwise synodic angles as compact arrays.
+        Returns a SynodicTable holding an (n_dates x n_bodies) longitude array and an
+        (n_dates x n_pairs) synodic angle array in `dtype` (e.g. np.float32); the labelled
+        DataFrame is only built on `to_frame()`.
+        If `workers` is greater than one, the longitudes are computed in a process pool
+        (see `get_heliocentric_longitudes_parallel`). Longitudes are measured in `frame`.
+        If `tolerance` (degrees) is given, bodies are sampled adaptively instead (see
+        `sample_adaptive`) and interpolated onto the `step` grid.
+        With `julian_dates`, the grid is built directly as UTC Julian dates, so fractional
+        (sub-day) steps create no pandas Timestamps; the table's index is then the Julian
+        date array and dates with missing longitudes are kept and flagged in `valid`.
+        With `accuracy` (arcseconds), only ephemeris sources validated to that accuracy
+        are used (see `get_heliocentric_longitudes_vectorized`).
+        """
+        if julian_dates:
+            index = julian_date_range(start, end, step)
+        else:
+            index = pd.date_range(start=start, end=end, freq=f'{step}D')
+        if len(index) == 0 or not bodies:
+            return SynodicTable(index[:0], bodies or [], np.empty((0, len(bodies or []))), dtype=dtype)
+
+        if tolerance is not None:
+            if julian_dates:
+                samples = self._sample_adaptive_jd(
+                    index[0], index[-1], bodies, tolerance, frame=frame, accuracy=accuracy
+                )
+                return SynodicTable(index, bodies, samples.longitudes(index), dtype=dtype)
+            samples = self.sample_adaptive(index[0], index[-1], bodies, tolerance, frame=frame, accuracy=accuracy)
+            return samples.resample(index, dtype=dtype)
+
+        dates = _to_time(index, format='jd', scale='utc') if julian_dates else index
+        # Calculate longitudes for all bodies in a single pass
+        if workers and workers > 1:
+            longitudes = self.get_heliocentric_longitudes_parallel(
+                dates, bodies, workers, chunk_size, frame=frame, accuracy=accuracy
+            )
+        else:
+            longitudes = self.get_heliocentric_longitudes_batch(dates, bodies, frame=frame, accuracy=accuracy)
+        return SynodicTable.from_longitudes(index, bodies, longitudes, dtype=dtype, drop_invalid=not julian_dates)
+
+    def calculate_longitudes_and_synodic_angles(
+            self,
+            start: str,
+            end: str,
+            bodies: list,
+            step: float = 7,
+            workers: Optional[int] = None,
+            chunk_size: Optional[int] = None,
+            frame: str = "icrs",
+            tolerance: Optional[float] = None,
+            output: str = "frame",
+            accuracy: Optional[float] = None
+    ):
+        """
+        Calculate heliocentric longitudes for a list of bodies and synodic angles between each pair over a time period.
+        Returns a DataFrame with columns for each body's longitude and each pair's synodic angle.
+        If `workers` is greater than one, the longitudes are computed in a process pool
+        (see `get_heliocentric_longitudes_parallel`). Longitudes are measured in `frame`.
+        With `tolerance` (degrees) the bodies are sampled adaptively and interpolated onto
+        the `step` grid, with every column within `tolerance` of the direct computation as
+        far as sampling can be refined: below `min_step` (one hour by default) refinement
+        stops and a warning is logged for the intervals still above it (see `sample_adaptive`).
+
+        `output` selects a leaner result for long or sub-day grids: "arrays" returns a dict
+        of NumPy arrays and "records" one structured array, both with a float64 "jd" (UTC
+        Julian date) column, a boolean "valid" column instead of dropped rows, and float32
+        longitudes and angles (see `SynodicTable.to_arrays`).
+
+        `accuracy` (arcseconds) restricts the computation to ephemeris sources validated
+        to that accuracy, cheapest first (see sources.py).
+        """
+        if output not in ("frame", "arrays", "records"):
+            raise ValueError(f"Unknown output {output!r}. Use 'frame', 'arrays' or 'records'")
+        if output == "frame":
+            return self.calculate_synodic_table(
+                start, end, bodies, step, workers=workers, chunk_size=chunk_size, frame=frame, tolerance=tolerance,
+                accuracy=accuracy
+            ).to_frame()
+        table = self.calculate_synodic_table(
+            start, end, bodies, step, dtype=np.float32, workers=workers, chunk_size=chunk_size, frame=frame,
+            tolerance=tolerance, julian_dates=True, accuracy=accuracy
+        )
+        return table.to_arrays() if output == "arrays" else table.to_records()
+
+    def sample_adaptive(
+            self,
+            start,
+            end,
+            bodies: list,
+            tolerance: float = 0.01,
+            max_step: float = 512.0,
+            min_step: float = 1.0 / 24.0,
+            frame: str = "icrs",
+            accuracy: Optional[float] = None
+    ) -> adaptive.AdaptiveSamples:
+        """
+        Sample each body's longitude on its own adaptive grid between `start` and `end`.
+        Intervals are bisected only where linear interpolation would be off by more than
+        `tolerance` degrees (per synodic angle; half of it per longitude), starting from a
+        step matched to each body's mean motion (at most `max_step` days) and never below
+        `min_step`, where intervals still above the tolerance are kept and logged.
+        Use `resample()` on the result for any regular output grid.
+        `accuracy` (arcseconds) limits the ephemeris sources as in `calculate_synodic_table`.
+        """
+        return self._sample_adaptive_jd(
+            float(to_julian_date(start)[0]), float(to_julian_date(end)[0]), bodies, tolerance, max_step, min_step,
+            frame, accuracy
+        )
+
+    def _sample_adaptive_jd(
+            self,
+            start_jd: float,
+            end_jd: float,
+            bodies: list,
+            tolerance: float,
+            max_step: float = 512.0,
+            min_step: float = 1.0 / 24.0,
+            frame: str = "icrs",
+            accuracy: Optional[float] = None
+    ) -> adaptive.AdaptiveSamples:
+        """`sample_adaptive` between UTC Julian dates."""
+        return adaptive.sample(
+            lambda jd, body: self.get_heliocentric_longitudes_at_jd(jd, [body], frame=frame, accuracy=accuracy)[:, 0],
+            bodies, float(start_jd), float(end_jd), tolerance, max_step, min_step
+        )
+
+    def iter_longitudes_and_synodic_angles(
+            self,
+            start: str,
+            end: str,
+            bodies: list,
+            step: float = 7,
+            chunk_rows: int = 10000,
+            skip_chunks: int = 0,
+            frame: str = "icrs"
+    ):
+        """
+        Generator version of `calculate_longitudes_and_synodic_angles`.
+        Yields DataFrames of at most `chunk_rows` dates each, so memory stays bounded
+        however long the range is. The first `skip_chunks` chunks are skipped without
+        being computed. Chunks whose rows were all dropped are yielded empty.
+        """
+        if not bodies:
+            return
+        from pandas.tseries.frequencies import to_offset
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        # Whole-nanosecond step, rounded as `pd.date_range(freq=f'{step}D')` rounds it,
+        # so chunk boundaries land exactly on the grid of the non-streamed calculation
+        step_ns = to_offset(f'{step}D').nanos
+        n_dates = (end_ts.value - start_ts.value) // step_ns + 1 if end_ts >= start_ts else 0
+        for first in range(skip_chunks * chunk_rows, n_dates, chunk_rows):
+            positions = np.arange(first, min(first + chunk_rows, n_dates), dtype=np.int64)
+            dates = pd.DatetimeIndex(start_ts.value + positions * step_ns)
+            longitudes = self.get_heliocentric_longitudes_batch(dates, bodies, frame=frame)
+            yield SynodicTable.from_longitudes(dates, bodies, longitudes).to_frame()
+
+    def stream_longitudes_and_synodic_angles(
+            self,
+            start: str,
+            end: str,
+            bodies: list,
+            path,
+            step: float = 7,
+            chunk_rows: int = 10000,
+            fmt: str = 'csv',
+            resume: bool = True,
+            frame: str = "icrs",
+            keep_checkpoint: bool = True
+    ) -> ChunkSink:
+        """
+        Compute longitudes and synodic angles chunk by chunk and append them to `path`
+        (a CSV file, or a directory of Parquet part files).
+        A checkpoint is written after every chunk; with `resume`, an interrupted run
+        with the same parameters continues after the last chunk written. Without
+        `keep_checkpoint`, the checkpoint is removed once the run completes.
+        """
+        params = {
+            'start': str(start),
+            'end': str(end),
+            'bodies': list(bodies),
+            'step': step,
+            'chunk_rows': chunk_rows,
+        }
+        if frame != "icrs":
+            # Only recorded for ecliptic runs, so checkpoints from earlier versions stay resumable
+            params['frame'] = frame
+        sink = ChunkSink(path, fmt=fmt, resume=resume, params=params)
+        if sink.complete:
+            return sink
+        for df in self.iter_longitudes_and_synodic_angles(
+                start, end, bodies, step, chunk_rows, skip_chunks=sink.chunks_written, frame=frame
+        ):
+            sink.write(df)
+        sink.close(keep_checkpoint)
+        return sink
 
     def calculate_synodic_period(
             self,
@@ -119,7 +634,8 @@ class Ephemeris:
             body_1: Optional[str] = None,
             body_2: Optional[str] = None,
             bodies: Optional[list] = None,
-            step: float = 7
+            step: float = 7,
+            frame: str = "icrs"
     ) -> pd.DataFrame:
         """
         Calculate the angular separation between two planets over a time period.
@@ -130,53 +646,184 @@ class Ephemeris:
           `calculate_longitudes_and_synodic_angles`).
         - Otherwise expects `body_1` and `body_2` and returns the pairwise
           synodic DataFrame (original behaviour, with caching).
+        Longitudes are measured in `frame`.
         """
         # If user supplied a list of bodies, delegate to the multi-body method
         if bodies:
             if not isinstance(bodies, (list, tuple)) or len(bodies) < 2:
                 raise ValueError("`bodies` must be a list/tuple with at least two names")
-            return self.calculate_longitudes_and_synodic_angles(start=start, end=end, bodies=bodies, step=step)
+            return self.calculate_longitudes_and_synodic_angles(
+                start=start, end=end, bodies=bodies, step=step, frame=frame
+            )
 
         # Fall back to original two-body behaviour
         if not body_1 or not body_2:
             raise ValueError("Either provide `bodies` (list) or both `body_1` and `body_2`")
 
-        cache_file = f"{body_1}_{body_2}_{start}-{end}"
-        cache_path = self.cache_dir / cache_file
-        if cache_path.exists():
-            try:
-                with open(cache_path, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                logger.warning(f"Cache load failed: {e}")
-
         dates = pd.date_range(start=start, end=end, freq=f'{step}D')
         if dates.empty:
             return pd.DataFrame()
 
-        lon1 = self.get_heliocentric_longitudes_vectorized(dates, body_1)
-        lon2 = self.get_heliocentric_longitudes_vectorized(dates, body_2)
+        # Cached samples are loaded from the longitude store; only missing ones are computed
+        longitudes = self.longitude_store.longitudes(
+            dates,
+            [body_1, body_2],
+            step,
+            lambda missing_dates, missing_bodies: self.get_heliocentric_longitudes_batch(
+                missing_dates, missing_bodies, strict=True, frame=frame
+            ),
+            frame=frame
+        )
 
-        df = pd.DataFrame({
-            body_1: lon1,
-            body_2: lon2,
-        }, index=dates)
+        with profiler.stage("dataframe_assembly"):
+            df = pd.DataFrame({
+                body_1: longitudes[body_1],
+                body_2: longitudes[body_2],
+            }, index=dates)
 
-        # Drop rows with NaN values
-        df.dropna(inplace=True)
-        if df.empty:
-            return pd.DataFrame()
+            # Drop rows with NaN values
+            df.dropna(inplace=True)
+            if df.empty:
+                return pd.DataFrame()
 
-        # Vectorized angular separation calculation
-        angle_diff = np.abs((df[body_2] - df[body_1]) % 360)
-        df[f"{body_2}-{body_1}"] = np.minimum(angle_diff, 360 - angle_diff)
+            # Vectorized angular separation calculation
+            angle_diff = np.abs((df[body_2] - df[body_1]) % 360)
+            df[f"{body_2}-{body_1}"] = np.minimum(angle_diff, 360 - angle_diff)
 
-        # Cache the result
-        try:
-            logger.debug(f"Caching result for {body_1} and {body_2} from {start} to {end}")
-            with open(cache_path, 'wb') as f:
-                pickle.dump(df, f)
-        except Exception as e:
-            logger.warning(f"cache fail to save: {e}")
+        return df
+
+    def get_heliocentric_longitudes_at_jd(
+            self,
+            jd,
+            bodies: list,
+            frame: str = "icrs",
+            accuracy: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Heliocentric longitudes for several bodies at arbitrary UTC Julian dates.
+        Returns an array of shape (n_dates, n_bodies).
+        """
+        times = _to_time(np.asarray(jd, dtype=float), format='jd', scale='utc')
+        return self.get_heliocentric_longitudes_batch(times, bodies, strict=True, frame=frame, accuracy=accuracy)
+
+    def find_synodic_events(
+            self,
+            start: str,
+            end: str,
+            bodies: Optional[list] = None,
+            pairs: Optional[list] = None,
+            angles=(0, 180),
+            step: float = 5,
+            tolerance: float = 30.0,
+            max_iterations: int = 50,
+            frame: str = "icrs"
+    ) -> pd.DataFrame:
+        """
+        Find the times at which pairs of bodies reach given synodic angles.
+
+        Sign changes of (elongation - target) are bracketed on a coarse grid of `step`
+        days, then every bracket is refined at once with a vectorized Illinois
+        (modified regula falsi) solver until the estimated timing error is below
+        `tolerance` seconds. The coarse step must be short enough that a pair's
+        elongation changes by less than 180 degrees per step.
+
+        Args:
+            start (str): Start date.
+            end (str): End date.
+            bodies (list): Body names; events are searched for every unique pair.
+            pairs (list): Explicit (body_1, body_2) pairs, used instead of `bodies`.
+            angles (iterable): Target synodic angles in degrees, between 0 and 180.
+            step (float): Coarse bracketing step in days.
+            tolerance (float): Timing precision in seconds.
+            max_iterations (int): Refinement iteration cap.
+            frame (str): Frame the longitudes are measured in (see frames.FRAMES).
+
+        Returns:
+            DataFrame: One row per event with columns `time`, `jd`, `body_1`, `body_2`,
+            `angle` (target synodic angle), `elongation` (signed (body_2 - body_1)
+            longitude difference at the event, 0-360) and `event` (conjunction,
+            opposition or aspect), sorted by time.
+        """
+        from itertools import combinations
+        columns = ['time', 'jd', 'body_1', 'body_2', 'angle', 'elongation', 'event']
+        if pairs is None:
+            pairs = list(combinations(bodies or [], 2))
+        angles = [float(a) for a in angles]
+        if any(a < 0 or a > 180 for a in angles):
+            raise ValueError("`angles` must be between 0 and 180 degrees")
+        start_jd = float(to_julian_date(start)[0])
+        end_jd = float(to_julian_date(end)[0])
+        if not pairs or end_jd <= start_jd:
+            return pd.DataFrame(columns=columns)
+
+        names = sorted({body for pair in pairs for body in pair})
+        column = {body: j for j, body in enumerate(names)}
+        grid = np.append(np.arange(start_jd, end_jd, step), end_jd)
+        longitudes = self.get_heliocentric_longitudes_at_jd(grid, names, frame=frame)
+
+        # Every (pair, signed elongation target) combination is one root-finding problem
+        problems = []
+        for body_1, body_2 in pairs:
+            for angle in angles:
+                for elongation in sorted({angle % 360, (360 - angle) % 360}):
+                    problems.append((body_1, body_2, angle, elongation))
+
+        # Per-problem body columns and targets, so residuals of all problems are one indexed expression
+        first = np.array([column[p[0]] for p in problems])
+        second = np.array([column[p[1]] for p in problems])
+        target = np.array([p[3] for p in problems])
+
+        def wrap(diff):
+            return (diff + 180.0) % 360.0 - 180.0
+
+        # Bracket sign changes, skipping the +/-180 wrap-around discontinuity
+        f = wrap(longitudes[:, second] - longitudes[:, first] - target)
+        crossing = (np.signbit(f[:-1]) != np.signbit(f[1:])) & (np.abs(f[1:] - f[:-1]) < 180.0)
+        # Brackets ordered by problem, then by time
+        owner, idx = np.nonzero(crossing.T)
+        a, b = grid[idx], grid[idx + 1]
+        fa, fb = f[idx, owner], f[idx + 1, owner]
+        if not len(owner):
+            return pd.DataFrame(columns=columns)
+
+        # Vectorized Illinois refinement of all brackets
+        tolerance_days = tolerance / 86400.0
+        root = a.copy()
+        side = np.zeros(len(owner), dtype=int)
+        active = np.ones(len(owner), dtype=bool)
+        for _ in range(max_iterations):
+            if not active.any():
+                break
+            i = np.flatnonzero(active)
+            c = b[i] - fb[i] * (b[i] - a[i]) / (fb[i] - fa[i])
+            lon = self.get_heliocentric_longitudes_at_jd(c, names, frame=frame)
+            rows, k = np.arange(len(i)), owner[i]
+            fc = wrap(lon[rows, second[k]] - lon[rows, first[k]] - target[k])
+            root[i] = c
+            slope = np.abs((fb[i] - fa[i]) / (b[i] - a[i]))
+            done = (np.abs(fc) / np.maximum(slope, 1e-12) < tolerance_days) | (b[i] - a[i] < tolerance_days)
+            same = np.signbit(fc) == np.signbit(fb[i])
+            # Root lies in [a, c]: move b, halving fa if b moved last time too
+            j = i[same]
+            fa[j] = np.where(side[j] == 1, fa[j] / 2.0, fa[j])
+            b[j], fb[j], side[j] = c[same], fc[same], 1
+            # Root lies in [c, b]: move a, halving fb if a moved last time too
+            j = i[~same]
+            fb[j] = np.where(side[j] == -1, fb[j] / 2.0, fb[j])
+            a[j], fa[j], side[j] = c[~same], fc[~same], -1
+            active[i[done]] = False
+        if active.any():
+            logger.warning("%d synodic events did not converge within %d iterations", active.sum(), max_iterations)
 
-        return df
\ No newline at end of file
+        events = pd.DataFrame({
+            'time': from_julian_date(root),
+            'jd': root,
+            'body_1': [problems[k][0] for k in owner],
+            'body_2': [problems[k][1] for k in owner],
+            'angle': [problems[k][2] for k in owner],
+            'elongation': [problems[k][3] for k in owner],
+        })
+        events['event'] = np.select(
+            [events['angle'] == 0, events['angle'] == 180], ['conjunction', 'opposition'], 'aspect'
+        )
+        return events.sort_values('jd', ignore_index=True)[columns]
@@ -0,0 +1,186 @@
+"""
+Asyncio front-end for `Ephemeris`.
+
+The ephemeris computations are CPU-bound and take seconds, so calling them
+from a coroutine would block the event loop. `AsyncEphemeris` runs them in an
+executor instead (a thread pool by default, or a process pool with one
+`Ephemeris` per worker process), and:
+
+- requests with the same parameters (bodies, range, step, source, frame) that
+  arrive while one is being computed await that computation instead of
+  starting another;
+- at most `max_concurrency` computations run at once; further requests wait
+  for a slot, which bounds memory use under bursts.
+
+    async with AsyncEphemeris() as eph:
+        df = await eph.calculate_longitudes_and_synodic_angles("2000-01-01", "2001-01-01", ["mars", "venus"])
+
+Coalesced callers receive the same result object; copy it before modifying it.
+"""
+
+import asyncio
+import numbers
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+import astro
+
+DEFAULT_MAX_CONCURRENCY = 4
+# Parameters holding dates, keyed by their ISO timestamp so equal dates coalesce
+DATE_PARAMETERS = ("start", "end")
+
+
+def _key_value(name: str, value):
+    """
+    Hashable, normalized form of a request parameter: numbers as floats (7 == 7.0)
+    and dates as ISO timestamps ('2000-01-01' == Timestamp('2000-01-01')).
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_value(name, item) for item in value)
+    if name in DATE_PARAMETERS or isinstance(value, (date, np.datetime64)):
+        try:
+            return pd.Timestamp(value).isoformat()
+        except (ValueError, TypeError):
+            return str(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    return str(value)
+
+
+def _run_in_worker(method: str, kwargs: dict):
+    """
+    Process pool task: call an `Ephemeris` method on the worker's instance (see `astro._init_worker`).
+    """
+    return getattr(astro._worker_ephemeris, method)(**kwargs)
+
+
+class AsyncEphemeris:
+    def __init__(
+            self,
+            ephemeris: Optional["astro.Ephemeris"] = None,
+            executor: Optional[Executor] = None,
+            processes: bool = False,
+            workers: Optional[int] = None,
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        """
+        Args:
+            ephemeris (Ephemeris): Instance used in thread mode, and whose settings
+                (Chebyshev source, cache directory) process workers copy. Created if omitted.
+            executor (Executor): Executor to run computations in. It is not shut down by `close()`.
+                With a process pool, pass `processes=True` too and build it with
+                `initializer=astro._init_worker`.
+            processes (bool): Create a process pool instead of a thread pool when no executor is given.
+            workers (int): Size of the created pool; defaults to `max_concurrency`.
+            max_concurrency (int): Largest number of computations running at once.
+        """
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be at least 1")
+        self.ephemeris = ephemeris or astro.Ephemeris()
+        self.processes = processes
+        self.max_concurrency = max_concurrency
+        self._owns_executor = executor is None
+        if executor is None:
+            workers = workers or max_concurrency
+            if processes:
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=astro._init_worker,
+                    initargs=(self.ephemeris.use_chebyshev, str(self.ephemeris.cache_dir))
+                )
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ephemeris")
+        self.executor = executor
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+
+    @property
+    def source(self) -> str:
+        return "chebyshev" if self.ephemeris.use_chebyshev else "reference"
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "computed": self.computed,
+                "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+    async def _submit(self, method: str, **kwargs):
+        """
+        Run `Ephemeris.<method>(**kwargs)` in the executor, sharing the computation
+        with any identical request already in flight.
+        """
+        key = (method, self.source) + tuple((name, _key_value(name, value)) for name, value in sorted(kwargs.items()))
+        self.requests += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._compute(method, kwargs))
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the computation other callers are waiting for
+        return await asyncio.shield(future)
+
+    async def _compute(self, method: str, kwargs: dict):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            if self.processes:
+                call = partial(_run_in_worker, method, kwargs)
+            else:
+                call = partial(getattr(self.ephemeris, method), **kwargs)
+            try:
+                return await loop.run_in_executor(self.executor, call)
+            finally:
+                self.computed += 1
+
+    async def calculate_longitudes_and_synodic_angles(
+            self,
+            start: str,
+            end: str,
+            bodies: list,
+            step: float = 7,
+            frame: str = "icrs",
+            tolerance: Optional[float] = None
+    ):
+        """Async `Ephemeris.calculate_longitudes_and_synodic_angles`."""
+        return await self._submit(
+            "calculate_longitudes_and_synodic_angles",
+            start=start, end=end, bodies=list(bodies), step=step, frame=frame, tolerance=tolerance
+        )
+
+    async def calculate_synodic_period(
+            self,
+            start: str,
+            end: str,
+            body_1: Optional[str] = None,
+            body_2: Optional[str] = None,
+            bodies: Optional[list] = None,
+            step: float = 7,
+            frame: str = "icrs"
+    ):
+        """Async `Ephemeris.calculate_synodic_period`."""
+        return await self._submit(
+            "calculate_synodic_period",
+            start=start, end=end, body_1=body_1, body_2=body_2,
+            bodies=list(bodies) if bodies else None, step=step, frame=frame
+        )
+
+    def close(self):
+        """Shut down the executor if this instance created it."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,331 @@
+"""
+Shared on-disk cache directory.
+
+The cache lives outside the installed package: in $PLATINUM_CACHE_DIR if set,
+otherwise in the user's cache directory (e.g. ~/.cache/platinum-tool). Files
+are written to a temporary file and renamed into place (`atomic_write`), and
+read-modify-write updates are serialized across processes with `file_lock`.
+
+`CacheManager` keeps a JSON manifest of the files it manages with their size
+and last access time, and evicts the least recently used ones when the total
+exceeds a byte budget ($PLATINUM_CACHE_MAX_BYTES, default 1 GiB). Accesses are
+recorded in memory and merged into the manifest on the next write or flush, so
+cache hits do not rewrite it; pending accesses of every live manager are
+flushed once at exit. Eviction also removes a file's lock, and skips files
+whose lock another process holds, files recorded as pinned, and everything
+under the pinned directories (the memo's shelve files, which stay open while
+a process uses them, and the position table).
+"""
+
+import atexit
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "platinum-tool"
+DEFAULT_MAX_BYTES = 1 << 30
+MANIFEST_NAME = "manifest.json"
+LOCK_SUFFIX = ".lock"
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+# Top-level cache directories whose files count towards the budget but are never evicted
+PINNED_DIRS = ("memo", "positions")
+
+# Managers with accesses to flush at exit; weak, so discarded managers are not kept alive
+_managers: "weakref.WeakSet[CacheManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for manager in list(_managers):
+        manager.flush()
+
+
+def parse_size(value) -> int:
+    """Byte count from an integer or a string such as "500M" or "2G"."""
+    text = str(value).strip().upper().rstrip("B")
+    if text and text[-1] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def cache_root() -> Path:
+    """Cache directory: $PLATINUM_CACHE_DIR, or the platform's per-user cache directory."""
+    configured = os.environ.get("PLATINUM_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        return base / APP_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / APP_NAME
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / APP_NAME
+
+
+@contextmanager
+def file_lock(path, blocking: bool = True):
+    """
+    Exclusive cross-process lock on `path` + ".lock" (fcntl on POSIX, msvcrt on Windows).
+    With `blocking=False`, raises BlockingIOError if another process holds it.
+    """
+    lock_path = Path(str(path) + LOCK_SUFFIX)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sys.platform == "win32":
+        import msvcrt
+        with open(lock_path, "a+b") as f:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if not blocking:
+                        raise BlockingIOError(f"{lock_path} is locked")
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        while True:
+            f = open(lock_path, "a+b")
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                # Eviction may have removed the lock file while we waited; lock the current one instead
+                try:
+                    current = os.stat(lock_path)
+                except FileNotFoundError:
+                    current = None
+                if current is not None and os.path.samestat(os.fstat(f.fileno()), current):
+                    break
+            except BaseException:
+                f.close()
+                raise
+            f.close()
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            f.close()
+
+
+def atomic_write(path, write: Callable, mode: str = "wb", suffix: str = ".tmp"):
+    """
+    Call `write(file)` on a temporary file next to `path`, then rename it into place,
+    so readers never see a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=suffix)
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class CacheManager:
+    def __init__(self, root=None, max_bytes: Optional[int] = None):
+        self.root = Path(root) if root else cache_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = parse_size(os.environ.get("PLATINUM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_bytes = int(max_bytes)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._accessed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        _managers.add(self)
+
+    def __del__(self):
+        self.flush()
+
+    def _key(self, path) -> str:
+        return Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)["files"]
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("Cache manifest unreadable, rebuilding it: %s", e)
+            return {}
+
+    def _save(self, files: Dict[str, dict]):
+        atomic_write(self.manifest_path, lambda f: json.dump({"files": files}, f), mode="w")
+
+    def _merge_accesses(self, files: Dict[str, dict]):
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        for key, when in accessed.items():
+            if key in files:
+                files[key]["atime"] = max(files[key]["atime"], when)
+
+    def touch(self, path):
+        """Record an access to a cached file (merged into the manifest later)."""
+        try:
+            key = self._key(path)
+        except ValueError:
+            return
+        with self._lock:
+            self._accessed[key] = time.time()
+
+    def record(self, *paths, pinned: bool = False):
+        """
+        Register files that were just written, then evict down to the budget, with one
+        manifest update for all of them. Pinned files (e.g. the position table and its
+        sidecar) count towards the total but are never evicted.
+        Call it after releasing any `file_lock` on the files themselves.
+        """
+        keys = {}
+        for path in paths:
+            try:
+                keys[self._key(path)] = Path(path)
+            except ValueError:
+                logger.debug("Not recording %s: outside the cache directory", path)
+        if not keys:
+            return
+        with file_lock(self.manifest_path):
+            files = self._load()
+            self._merge_accesses(files)
+            now = time.time()
+            for key, path in keys.items():
+                try:
+                    files[key] = {"size": path.stat().st_size, "atime": now}
+                except FileNotFoundError:
+                    files.pop(key, None)
+                    continue
+                if pinned:
+                    files[key]["pinned"] = True
+            self._evict(files, self.max_bytes, keep=keys)
+            self._save(files)
+
+    def flush(self):
+        """Write pending access times to the manifest."""
+        if not getattr(self, "_accessed", None) or not self.root.exists():
+            return
+        try:
+            with file_lock(self.manifest_path):
+                files = self._load()
+                self._merge_accesses(files)
+                self._save(files)
+        except Exception as e:
+            logger.warning("Cache manifest update failed: %s", e)
+
+    def _scan(self, files: Dict[str, dict]):
+        """
+        Add untracked cache files (e.g. written before the manifest existed), drop vanished
+        ones and remove lock files left behind by files that no longer exist.
+        """
+        seen = set()
+        for path in self.root.rglob("*"):
+            if path.name == MANIFEST_NAME or path.suffix == ".tmp":
+                continue
+            if path.suffix == LOCK_SUFFIX:
+                target = path.with_suffix("")
+                if target.name != MANIFEST_NAME and not target.exists():
+                    self._remove(target)
+                continue
+            try:
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            key = path.relative_to(self.root).as_posix()
+            seen.add(key)
+            if key not in files:
+                files[key] = {"size": stat.st_size, "atime": stat.st_mtime}
+            else:
+                files[key]["size"] = stat.st_size
+            if key.split("/", 1)[0] in PINNED_DIRS:
+                files[key]["pinned"] = True
+        for key in set(files) - seen:
+            del files[key]
+
+    def _remove(self, path: Path) -> bool:
+        """
+        Delete a cache file and its lock file, unless another process holds the lock
+        (it is then reading or updating the file). Returns whether the file is gone.
+        """
+        try:
+            with file_lock(path, blocking=False):
+                # Readers that already opened or mapped the file keep their view of it
+                path.unlink(missing_ok=True)
+                Path(str(path) + LOCK_SUFFIX).unlink(missing_ok=True)
+        except BlockingIOError:
+            logger.debug("Cache file %s is in use, not evicting it", path)
+            return False
+        except OSError as e:
+            logger.warning("Cache eviction failed for %s: %s", path, e)
+            return not path.exists()
+        return True
+
+    def _evict(self, files: Dict[str, dict], max_bytes: int, keep=()) -> int:
+        """
+        Delete least recently used unpinned files until the total fits `max_bytes`
+        (skipping the keys in `keep`); returns bytes freed.
+        """
+        total = sum(entry["size"] for entry in files.values())
+        freed = 0
+        for key in sorted(files, key=lambda k: files[k]["atime"]):
+            if total <= max_bytes:
+                break
+            if key in keep or files[key].get("pinned") or key.split("/", 1)[0] in PINNED_DIRS:
+                continue
+            if not self._remove(self.root / key):
+                continue
+            total -= files[key]["size"]
+            freed += files.pop(key)["size"]
+        if freed:
+            logger.info("Evicted %d bytes from the cache", freed)
+        return freed
+
+    def stats(self) -> dict:
+        """Cache location, budget, file count, total size and access time range."""
+        with file_lock(self.manifest_path):
+            files = self._load()
+            self._merge_accesses(files)
+            self._scan(files)
+            self._save(files)
+        atimes = [entry["atime"] for entry in files.values()]
+        return {
+            "root": str(self.root),
+            "max_bytes": self.max_bytes,
+            "files": len(files),
+            "bytes": sum(entry["size"] for entry in files.values()),
+            "oldest_access": min(atimes) if atimes else None,
+            "newest_access": max(atimes) if atimes else None,
+        }
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used files down to `max_bytes` (default: the budget); returns bytes freed."""
+        with file_lock(self.manifest_path):
+            files = self._load()
+            self._merge_accesses(files)
+            self._scan(files)
+            freed = self._evict(files, self.max_bytes if max_bytes is None else int(max_bytes))
+            self._save(files)
+        return freed
@@ -45,6 +45,24 @@ class Calculations:
             return int(total_seconds // 3600)
         return None
 
+    @staticmethod
+    def calculate_time_differences(starts, ends, scale=None):
+        """
+        Vectorized version of `calculate_time_difference` over arrays of date pairs.
+
+        Args:
+            starts (array-like): Start dates (NumPy datetime64 array or pandas Series).
+            ends (array-like): End dates, same length as `starts`.
+            scale (str): Optional scale (years, months, weeks, days, hours).
+
+        Returns:
+            dict or tuple: Column arrays for the given scale, or a dict of them for
+            every scale if `scale` is None. Each element matches the scalar result.
+        """
+        from calendar_math import time_differences
+        results = time_differences(starts, ends)
+        return results if scale is None else results[scale]
+
     @staticmethod
     def calculate_delta(scale, duration, operation):
         """
@@ -75,6 +93,23 @@ class Calculations:
         elif scale == "hours":
             return timedelta(hours=duration)
 
+    @staticmethod
+    def calculate_offsets(origins, durations, scales, operations="+"):
+        """
+        Vectorized version of `start + calculate_delta(scale, duration, operation)`.
+
+        Args:
+            origins (array-like): Origin dates.
+            durations (array-like): Durations to apply.
+            scales (array-like or str): Scales (years, months, weeks, days, hours).
+            operations (array-like or str): Operations (+ or -).
+
+        Returns:
+            ndarray: datetime64[us] array of the resulting dates.
+        """
+        from calendar_math import apply_offsets
+        return apply_offsets(origins, durations, scales, operations)
+
     @staticmethod
     def time_difference():
         """Calculate the time difference between two dates."""
@@ -123,22 +158,17 @@ class Calculations:
 
         scaling_mode = Menus.choose_scaling_mode()
         try:
+            from scaling import scale_values
             if scaling_mode == "custom":
                 custom_input = input("Enter ratios separated by commas (e.g. 0.5, 0.75): ")
                 scaling_ratios = [float(r.strip()) for r in custom_input.split(",")]
-                scaled_values = [float(time_diff) * r for r in scaling_ratios]
             else:
                 scaling_ratios = Valid.get_scaling_configuration(scaling_mode)
-                if scaling_mode == "extension":
-                    scaled_values = []
-                    scaled_value = time_diff
-                    for r in scaling_ratios:
-                        scaled_value = scaled_value * r
-                        scaled_values.append(scaled_value)
-                else:
-                    scaled_values = [float(time_diff) * r for r in scaling_ratios]
-            Csv.prepare_and_export_data(scaled_values, scaling_ratios, scale, time_diff, scaling_mode, start_date, end_date)
-        except ValueError as e:
+            scaled_values = scale_values(time_diff, scaling_ratios, scaling_mode)
+            path = input("Enter file path to export (.csv, .parquet, .arrow) or press Enter to skip: ").strip()
+            Csv.prepare_and_export_data(scaled_values, scaling_ratios, scale, time_diff, scaling_mode, start_date, end_date,
+                                        path=path or None)
+        except (ValueError, ImportError) as e:
             print(f"Error in calculations: {e}")
 
     @staticmethod
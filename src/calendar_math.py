@@ -0,0 +1,151 @@
+"""
+Vectorized calendar arithmetic over arrays of dates.
+
+These functions mirror the scalar `Calculations` methods, which use
+`relativedelta` and `timedelta` one date at a time, but work on whole NumPy
+`datetime64` arrays (or pandas Series) with integer arithmetic.
+"""
+
+import numpy as np
+
+US_PER_DAY = 86400 * 10**6
+
+
+def _as_datetime64(values) -> np.ndarray:
+    return np.atleast_1d(np.asarray(values, dtype='datetime64[us]'))
+
+
+def _split(dates: np.ndarray):
+    """Split datetime64[us] values into (months since 1970-01, day of month, time of day in us)."""
+    month_start = dates.astype('datetime64[M]')
+    day_start = dates.astype('datetime64[D]')
+    months = month_start.astype(np.int64)
+    day = (day_start - month_start.astype('datetime64[D]')).astype(np.int64) + 1
+    time_of_day = (dates - day_start).astype(np.int64)
+    return months, day, time_of_day
+
+
+def days_in_month(months: np.ndarray) -> np.ndarray:
+    """Number of days in each month, given as months since 1970-01."""
+    first = months.astype('datetime64[M]').astype('datetime64[D]')
+    following = (months + 1).astype('datetime64[M]').astype('datetime64[D]')
+    return (following - first).astype(np.int64)
+
+
+def add_months(dates, months) -> np.ndarray:
+    """
+    Add whole months to dates, clamping the day to the end of the target month
+    the way `relativedelta(months=n)` does (e.g. Jan 31 + 1 month = Feb 28/29).
+    """
+    dates = _as_datetime64(dates)
+    base, day, time_of_day = _split(dates)
+    target = base + np.asarray(months, dtype=np.int64)
+    day = np.minimum(day, days_in_month(target))
+    result = target.astype('datetime64[M]').astype('datetime64[D]') + (day - 1)
+    return result.astype('datetime64[us]') + time_of_day.astype('timedelta64[us]')
+
+
+def time_differences(starts, ends) -> dict:
+    """
+    Time differences between pairs of dates for every scale at once.
+
+    Args:
+        starts: Array-like of start dates (datetime64 array, pandas Series, datetimes).
+        ends: Array-like of end dates, same length as `starts`.
+
+    Returns:
+        dict: Scale name to a tuple of integer arrays (a single array for hours), matching the scalar
+        `Calculations.calculate_time_difference` results element by element:
+            "years": (years, months, days)
+            "months": (months, days)
+            "weeks": (weeks, days)
+            "days": (days, hours)
+            "hours": hours
+    """
+    starts, ends = _as_datetime64(starts), _as_datetime64(ends)
+    if starts.shape != ends.shape:
+        raise ValueError("`starts` and `ends` must have the same length")
+    swap = starts > ends
+    starts, ends = np.where(swap, ends, starts), np.where(swap, starts, ends)
+
+    # Calendar months, as relativedelta computes them: the month difference,
+    # reduced by one if adding it to the start overshoots the end
+    start_months, _, _ = _split(starts)
+    end_months, _, _ = _split(ends)
+    months = end_months - start_months
+    shifted = add_months(starts, months)
+    overshoot = ends < shifted
+    months = months - overshoot
+    shifted = np.where(overshoot, add_months(starts, months), shifted)
+    remainder_days = (ends - shifted).astype(np.int64) // US_PER_DAY
+
+    # Elapsed time, using the same float seconds as timedelta.total_seconds()
+    total_seconds = (ends - starts).astype(np.int64).astype(np.float64) / 1e6
+    total_days = (total_seconds // 86400).astype(np.int64)
+
+    return {
+        "years": (months // 12, months % 12, remainder_days),
+        "months": (months, remainder_days),
+        "weeks": (total_days // 7, total_days % 7),
+        "days": (total_days, ((total_seconds % 86400) // 3600).astype(np.int64)),
+        "hours": (total_seconds // 3600).astype(np.int64),
+    }
+
+
+# Length of the fixed-size scales in microseconds
+FIXED_SCALE_US = {
+    "weeks": 7 * US_PER_DAY,
+    "days": US_PER_DAY,
+    "hours": 3600 * 10**6,
+}
+CALENDAR_SCALE_MONTHS = {
+    "years": 12,
+    "months": 1,
+}
+
+
+def apply_offsets(origins, durations, scales, operations="+") -> np.ndarray:
+    """
+    Apply date offsets in bulk.
+
+    Mirrors `start + Calculations.calculate_delta(scale, duration, operation)`
+    element by element: years and months are truncated to whole units and added
+    with end-of-month clamping like `relativedelta`; weeks, days and hours may be
+    fractional and are converted like `timedelta`: whole units exactly, and the
+    fractional part rounded half to even to the microsecond.
+
+    Args:
+        origins: Array-like of origin dates (or a single date).
+        durations: Array-like of non-negative durations (or a single value).
+        scales: Array-like of scales (years, months, weeks, days, hours) or a single scale.
+        operations: Array-like of "+"/"-" (or a single operation).
+
+    Returns:
+        ndarray: datetime64[us] array of the resulting dates.
+    """
+    origins = _as_datetime64(origins)
+    durations = np.asarray(durations, dtype=np.float64)
+    scales = np.asarray(scales)
+    operations = np.asarray(operations)
+    origins, durations, scales, operations = np.broadcast_arrays(origins, durations, scales, operations)
+
+    invalid_ops = ~np.isin(operations, ["+", "-"])
+    if invalid_ops.any():
+        raise ValueError("Invalid operation. Use '+' or '-'.")
+    signed = np.where(operations == "-", -durations, durations)
+
+    result = np.empty(origins.shape, dtype='datetime64[us]')
+    for scale in np.unique(scales):
+        mask = scales == scale
+        if scale in CALENDAR_SCALE_MONTHS:
+            months = np.trunc(signed[mask]).astype(np.int64) * CALENDAR_SCALE_MONTHS[scale]
+            result[mask] = add_months(origins[mask], months)
+        elif scale in FIXED_SCALE_US:
+            # Like timedelta: whole units exactly, then the fraction rounded half to even
+            fraction, whole = np.modf(signed[mask])
+            offset = (whole.astype(np.int64) * FIXED_SCALE_US[scale]
+                      + np.rint(fraction * FIXED_SCALE_US[scale]).astype(np.int64))
+            result[mask] = origins[mask] + offset.astype('timedelta64[us]')
+        else:
+            raise ValueError(f"Invalid scale: {scale}")
+    return result
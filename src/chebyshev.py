@@ -0,0 +1,263 @@
+"""
+Chebyshev coefficient store for fast heliocentric longitude lookups.
+
+Each body's heliocentric position is fitted once, over fixed-length segments,
+from the astropy reference path in `astro.Ephemeris`. Later lookups are pure
+NumPy polynomial evaluations.
+
+Series are fitted and evaluated in TT Julian dates: UTC days containing a leap
+second are longer, so a segment spanning one would otherwise be fitted to a
+position with a kink in it.
+"""
+
+import logging
+import warnings
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+import frames
+from cache import atomic_write
+from instrument import profiler
+
+logger = logging.getLogger(__name__)
+
+# Julian date of the Unix epoch, used to convert datetime64 values without astropy
+UNIX_EPOCH_JD = 2440587.5
+
+# TT - TAI in days
+TT_MINUS_TAI = 32.184 / 86400.0
+
+# Maximum longitude error (arcseconds) of the default fit against the astropy
+# reference path. With 16-day segments and degree 10 the measured error is a few
+# milli-arcseconds even for Mercury and the Moon, so this leaves ample margin.
+MAX_ERROR_ARCSEC = 0.1
+
+
+def to_julian_date(dates) -> np.ndarray:
+    """
+    Convert dates to UTC Julian dates using NumPy only.
+
+    Accepts anything `np.asarray(..., dtype='datetime64[ns]')` understands
+    (pandas DatetimeIndex/Series, datetime objects, ISO strings) as well as
+    astropy `Time` objects.
+    """
+    if hasattr(dates, 'utc') and hasattr(dates, 'jd'):
+        return np.atleast_1d(np.asarray(dates.utc.jd, dtype=float))
+    ns = np.atleast_1d(np.asarray(dates, dtype='datetime64[ns]')).astype(np.int64)
+    return ns / 86400e9 + UNIX_EPOCH_JD
+
+
+def utc_to_tt(jd) -> np.ndarray:
+    """
+    Convert UTC Julian dates to TT with ERFA's leap second table, the conversion
+    astropy applies to `Time(jd, format='jd', scale='utc').tt`.
+    """
+    import erfa
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    with warnings.catch_warnings():
+        # Dates outside the leap second table ("dubious year") convert as astropy converts them
+        warnings.simplefilter("ignore", erfa.ErfaWarning)
+        tai1, tai2 = erfa.utctai(jd, np.zeros_like(jd))
+    return tai1 + (tai2 + TT_MINUS_TAI)
+
+
+def leap_second_jd() -> np.ndarray:
+    """UTC Julian dates at which TAI - UTC changes (leap seconds, and the 1960s rate steps)."""
+    import erfa
+    table = erfa.leap_seconds.get()
+    day1, day2 = erfa.cal2jd(table['year'], table['month'], np.ones(len(table), dtype=np.int32))
+    return day1 + day2
+
+
+def julian_date_range(start, end, step: float) -> np.ndarray:
+    """
+    Regular grid of UTC Julian dates from `start` to `end` inclusive, every `step`
+    days (fractional steps allowed), built without pandas Timestamps.
+    """
+    if step <= 0:
+        raise ValueError("`step` must be positive")
+    start_jd = float(to_julian_date(start)[0])
+    end_jd = float(to_julian_date(end)[0])
+    if end_jd < start_jd:
+        return np.empty(0)
+    # The small allowance keeps `end` on the grid despite rounding of fractional steps
+    count = int(np.floor((end_jd - start_jd) / step + 1e-9)) + 1
+    return start_jd + np.arange(count) * float(step)
+
+
+def from_julian_date(jd) -> np.ndarray:
+    """Convert UTC Julian dates back to `datetime64[ns]` values using NumPy only."""
+    ns = np.rint((np.asarray(jd, dtype=float) - UNIX_EPOCH_JD) * 86400e9).astype(np.int64)
+    return ns.astype('datetime64[ns]')
+
+
+class ChebyshevSeries:
+    """Piecewise Chebyshev fit of one body's heliocentric position (AU) over TT Julian dates."""
+
+    def __init__(self, start_jd: float, segment_days: float, coefficients: np.ndarray):
+        self.start_jd = float(start_jd)
+        self.segment_days = float(segment_days)
+        # Shape: (3, n_segments, degree + 1)
+        self.coefficients = coefficients
+
+    @property
+    def end_jd(self) -> float:
+        return self.start_jd + self.segment_days * self.coefficients.shape[1]
+
+    def covers(self, jd: np.ndarray) -> np.ndarray:
+        """Boolean mask of the TT Julian dates that fall inside the fitted range."""
+        return (jd >= self.start_jd) & (jd <= self.end_jd)
+
+    def positions(self, jd: np.ndarray) -> np.ndarray:
+        """Evaluate the (3, n) heliocentric position for TT Julian dates inside the range."""
+        offset = (jd - self.start_jd) / self.segment_days
+        segment = np.clip(np.floor(offset).astype(np.int64), 0, self.coefficients.shape[1] - 1)
+        x = 2.0 * (offset - segment) - 1.0
+        return np.stack([
+            chebyshev.chebval(x, self.coefficients[axis][segment].T, tensor=False)
+            for axis in range(3)
+        ])
+
+    def longitudes(self, jd: np.ndarray) -> np.ndarray:
+        """Heliocentric longitudes in degrees, in [0, 360), for TT Julian dates."""
+        x, y, _ = self.positions(jd)
+        return np.degrees(np.arctan2(y, x)) % 360
+
+
+class ChebyshevStore:
+    """
+    Per-body store of Chebyshev coefficients fitted from an `Ephemeris`.
+
+    Coefficients are fitted lazily on first use of a body, then kept in memory
+    and saved as `.npz` files so later processes only pay for the load.
+    """
+
+    def __init__(
+            self,
+            ephemeris,
+            start: str = '1800-01-01',
+            end: str = '2200-01-01',
+            segment_days: float = 16.0,
+            degree: int = 10,
+            source: str = 'builtin',
+            directory: Optional[Path] = None
+    ):
+        self.ephemeris = ephemeris
+        self.start_jd = float(to_julian_date(start)[0])
+        self.end_jd = float(to_julian_date(end)[0])
+        if self.end_jd <= self.start_jd:
+            raise ValueError("`end` must be after `start`")
+        self.segment_days = float(segment_days)
+        self.degree = int(degree)
+        self.source = source
+        self.directory = Path(directory) if directory else Path(ephemeris.cache_dir) / "chebyshev"
+        self._series: Dict[str, ChebyshevSeries] = {}
+
+    def _path(self, body: str) -> Path:
+        name = (f"{body}_{self.source}_{self.start_jd:.1f}-{self.end_jd:.1f}"
+                f"_{self.segment_days:g}d_deg{self.degree}.npz")
+        return self.directory / name
+
+    def fit(self, body: str) -> ChebyshevSeries:
+        """Fit a body over the whole store range from the astropy reference path."""
+        n_nodes = self.degree + 1
+        start_tt, end_tt = utc_to_tt([self.start_jd, self.end_jd])
+        n_segments = int(np.ceil((end_tt - start_tt) / self.segment_days))
+        k = np.arange(n_nodes)
+        theta = np.pi * (k + 0.5) / n_nodes
+        nodes = np.cos(theta)
+        # Sample every segment at its Chebyshev nodes in a single reference call
+        jd = (start_tt + np.arange(n_segments)[:, None] * self.segment_days
+              + (nodes[None, :] + 1.0) / 2.0 * self.segment_days)
+        logger.info("Fitting Chebyshev series for %s over %d segments", body, n_segments)
+        values = self.ephemeris.get_heliocentric_positions(jd.ravel(), body, source=self.source, scale='tt')
+        values = values.reshape(3, n_segments, n_nodes)
+        # Discrete Chebyshev transform at the Chebyshev nodes
+        coefficients = values @ np.cos(np.outer(k, theta)).T * (2.0 / n_nodes)
+        coefficients[..., 0] /= 2.0
+        return ChebyshevSeries(start_tt, self.segment_days, coefficients)
+
+    def series(self, body: str) -> ChebyshevSeries:
+        """Return the fitted series for a body, loading or fitting it on first use."""
+        if body in self._series:
+            return self._series[body]
+        path = self._path(body)
+        series = None
+        if path.exists():
+            try:
+                with np.load(path) as data:
+                    series = ChebyshevSeries(float(data['start_jd']), float(data['segment_days']),
+                                             data['coefficients'])
+                if getattr(self.ephemeris, "cache", None) is not None:
+                    self.ephemeris.cache.touch(path)
+            except Exception as e:
+                logger.warning("Chebyshev cache load failed for %s: %s", body, e)
+        if series is None:
+            series = self.fit(body)
+            try:
+                atomic_write(path, lambda f: np.savez(f, start_jd=series.start_jd,
+                                                      segment_days=series.segment_days,
+                                                      coefficients=series.coefficients))
+                if getattr(self.ephemeris, "cache", None) is not None:
+                    self.ephemeris.cache.record(path)
+            except Exception as e:
+                logger.warning("Chebyshev cache failed to save for %s: %s", body, e)
+        self._series[body] = series
+        return series
+
+    def longitudes(self, dates, body: str, frame: str = "icrs") -> np.ndarray:
+        """
+        Heliocentric longitudes for arbitrary dates, in `frame` (see frames.py).
+
+        Dates inside the store range are evaluated with NumPy only; any outside it
+        go through the astropy reference path.
+        """
+        jd = to_julian_date(dates)
+        series = self.series(body)
+        with profiler.stage("chebyshev_eval"):
+            tt = utc_to_tt(jd)
+            inside = series.covers(tt)
+            result = np.empty(len(jd))
+            if frame == "icrs":
+                result[inside] = series.longitudes(tt[inside])
+            else:
+                result[inside] = frames.longitudes(
+                    series.positions(tt[inside]), frames.rotation_matrices_jd(frame, jd[inside])
+                )
+        if not inside.all():
+            profiler.count("chebyshev_out_of_range", int((~inside).sum()))
+            result[~inside] = self.ephemeris.get_heliocentric_longitudes_jd(jd[~inside], body, frame=frame)
+        return result
+
+    def max_error(self, body: str, dates=None, samples: int = 2000) -> float:
+        """
+        Maximum longitude difference (arcseconds) against the astropy reference path.
+
+        If `dates` is not given, `samples` random dates across the store range are used,
+        plus hourly dates over the two days around each change of TAI - UTC in the range.
+        """
+        if dates is None:
+            rng = np.random.default_rng(0)
+            leaps = leap_second_jd()
+            leaps = leaps[(leaps > self.start_jd + 1) & (leaps < self.end_jd - 1)]
+            around = (leaps[:, None] + np.arange(-24, 25) / 24.0).ravel()
+            jd = np.sort(np.concatenate([rng.uniform(self.start_jd, self.end_jd, samples), around]))
+        else:
+            jd = to_julian_date(dates)
+        fast = self.series(body).longitudes(utc_to_tt(jd))
+        reference = self.ephemeris.get_heliocentric_longitudes_jd(jd, body, source=self.source)
+        diff = (fast - reference + 180.0) % 360.0 - 180.0
+        return float(np.abs(diff).max() * 3600.0)
+
+    def check(self, body: str, max_error_arcsec: float = MAX_ERROR_ARCSEC, **kwargs) -> float:
+        """Verify the fit against the reference path, raising if it exceeds the bound."""
+        error = self.max_error(body, **kwargs)
+        if error > max_error_arcsec:
+            raise ValueError(
+                f"Chebyshev fit for {body} is off by {error:.4f} arcsec "
+                f"(bound {max_error_arcsec} arcsec)"
+            )
+        return error
@@ -3,9 +3,13 @@
 Platinum-tool: A minimalistic time calculator CLI.
 
 This tool provides a simple command-line interface for time calculations.
+
+Heavy modules (astropy, pandas, numpy, dateutil) are imported by the menus
+that need them, so starting the tool and using the time calculator stays fast.
 """
-from calculations import Calculations
-from astro import Ephemeris
+import argparse
+import logging
+import os
 
 def show_welcome():
     print("Welcome to Platinum-tool!")
@@ -30,6 +34,7 @@ def handle_help():
     print("- Contact: awuahbj@gmail.com\n")
 
 def handle_time_calculation():
+    from calculations import Calculations
     while True:
         print("Time Calculation Menu:")
         print("1. Calculate time difference between two dates")
@@ -46,7 +51,14 @@ def handle_time_calculation():
         else:
             print("Invalid choice. Please try again.\n")
 
+def service_client():
+    """Client for a running local ephemeris server (see --serve), or None."""
+    from server import ServiceClient
+    client = ServiceClient()
+    return client if client.available() else None
+
 def handle_astro_calculation():
+    client = service_client()
     while True:
         print("Astro Calculation Menu:")
         print("1. Sidereal calculations")
@@ -62,15 +74,26 @@ def handle_astro_calculation():
             bodies_input = input("Enter planet names separated by commas (e.g., mars,venus): ")
             bodies = [b.strip() for b in bodies_input.split(',')]
             step = float(input("Enter step in days (default 7): ") or 7)
-            eph = Ephemeris()
-            df = eph.calculate_longitudes_and_synodic_angles(start, end, bodies, step)
-            print(df.head())
+            if client:
+                df = client.query({"type": "sidereal", "start": start, "end": end, "bodies": bodies, "step": step})
+                print(df.head())
+            else:
+                from astro import Ephemeris
+                eph = Ephemeris()
+                # Preview the first chunk only; the full range is streamed to disk in chunks
+                preview = next(eph.iter_longitudes_and_synodic_angles(start, end, bodies, step, chunk_rows=5), None)
+                print(preview.head() if preview is not None else "No results")
             save_dir = input("Enter directory path to save results: ")
             if save_dir:
                 import os
                 os.makedirs(save_dir, exist_ok=True)
                 filepath = os.path.join(save_dir, "sidereal_longitudes.csv")
-                df.to_csv(filepath)
+                if client:
+                    df.to_csv(filepath)
+                else:
+                    # Each save starts over (like overwriting the file) and leaves no checkpoint behind
+                    eph.stream_longitudes_and_synodic_angles(start, end, bodies, filepath, step,
+                                                             resume=False, keep_checkpoint=False)
                 print(f"Results saved to {filepath}")
         elif choice == "2":
             # Synodic calculation
@@ -79,8 +102,11 @@ def handle_astro_calculation():
             bodies_input = input("Enter planet names separated by commas (e.g., mars,venus): ")
             bodies = [b.strip() for b in bodies_input.split(',')]
             step = float(input("Enter step in days (default 7): ") or 7)
-            eph = Ephemeris()
-            df = eph.calculate_synodic_period(start, end, bodies=bodies, step=step)
+            if client:
+                df = client.query({"type": "synodic", "start": start, "end": end, "bodies": bodies, "step": step})
+            else:
+                from astro import Ephemeris
+                df = Ephemeris().calculate_synodic_period(start, end, bodies=bodies, step=step)
             print(df.head())
             save_dir = input("Enter directory path to save results: ")
             if save_dir:
@@ -93,9 +119,13 @@ def handle_astro_calculation():
             # Get planet positions
             date = input("Enter date (YYYY-MM-DD): ")
             bodies = ['mercury', 'venus', 'earth', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune']
-            eph = Ephemeris()
-            # For a single date, calculate longitudes and synodic angles
-            df = eph.calculate_longitudes_and_synodic_angles(date, date, bodies, step=1)
+            if client:
+                df = client.query({"type": "position", "date": date, "bodies": bodies})
+            else:
+                # Interpolated from the precomputed table (see --build-positions) when it covers
+                # the date, otherwise calculated live
+                from position_table import positions
+                df = positions(date, bodies)
             print("Planetary Positions on", date)
             print(df.T)  # Transpose for better view
             save_dir = input("Enter directory path to save results: ")
@@ -110,7 +140,95 @@ def handle_astro_calculation():
         else:
             print("Invalid choice. Please try again.\n")
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="platinum-tool", description="A minimalistic time calculator CLI.")
+    parser.add_argument("--jobs", metavar="FILE",
+                        help="Run the queries in a JSON or CSV job file non-interactively")
+    parser.add_argument("--output", metavar="DIR", default="results",
+                        help="Directory for job result files (default: results)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Number of jobs to run concurrently (default: 4)")
+    parser.add_argument("--key", help="Access key for batch and server mode (default: $PLATINUM_KEY)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run a warm local ephemeris server for the CLI and other clients")
+    parser.add_argument("--port", type=int,
+                        help="Port for --serve (default: $PLATINUM_SERVER or 8765)")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="Show the cache location, size and budget")
+    parser.add_argument("--cache-prune", metavar="SIZE", nargs="?", const="",
+                        help="Evict least recently used cache files down to SIZE (e.g. 500M; default: the budget)")
+    parser.add_argument("--build-positions", metavar="DATE", nargs="*",
+                        help="Precompute the daily planet position table used by 'Get planet position', "
+                             "optionally for START END [STEP] (default: 1800-01-01 2200-01-01 1)")
+    parser.add_argument("--profile", metavar="FILE", nargs="?", const="-",
+                        help="Time the astro pipeline stages and print a breakdown on exit, "
+                             "or write it as JSON to FILE")
+    return parser.parse_args(argv)
+
+def run_batch(args):
+    from license import validate_key
+    if not validate_key(args.key or os.environ.get("PLATINUM_KEY", "")):
+        print("Invalid or expired access key. Exiting.")
+        return 1
+    from jobs import run_jobs
+    summary = run_jobs(args.jobs, args.output, workers=args.workers)
+    failed = [job for job in summary if job["status"] != "ok"]
+    print(f"Ran {len(summary)} jobs, {len(failed)} failed. Results in {args.output}")
+    for job in failed:
+        print(f"- {job['id']}: {job['error']}")
+    return 1 if failed else 0
+
+def run_server(args):
+    from license import validate_key
+    if not validate_key(args.key or os.environ.get("PLATINUM_KEY", "")):
+        print("Invalid or expired access key. Exiting.")
+        return 1
+    from server import serve, server_address
+    host, port = server_address()
+    print(f"Serving on http://{host}:{args.port or port} (Ctrl+C to stop)")
+    serve(host, args.port or port)
+    return 0
+
+def run_cache(args):
+    from datetime import datetime
+    from cache import CacheManager, format_size, parse_size
+    manager = CacheManager()
+    if args.cache_prune is not None:
+        freed = manager.prune(parse_size(args.cache_prune) if args.cache_prune else None)
+        print(f"Freed {format_size(freed)}")
+    stats = manager.stats()
+    print(f"Cache directory: {stats['root']}")
+    print(f"Files: {stats['files']}, size: {format_size(stats['bytes'])} of {format_size(stats['max_bytes'])}")
+    if stats['oldest_access'] is not None:
+        oldest = datetime.fromtimestamp(stats['oldest_access']).strftime('%Y-%m-%d %H:%M')
+        print(f"Least recently used file last accessed {oldest}")
+    return 0
+
+def run_build_positions(args):
+    import position_table
+    values = args.build_positions
+    if len(values) not in (0, 2, 3):
+        print("--build-positions takes no arguments or START END [STEP]")
+        return 1
+    start, end = values[:2] or (position_table.DEFAULT_START, position_table.DEFAULT_END)
+    step = float(values[2]) if len(values) == 3 else 1.0
+    from astro import Ephemeris
+    table = position_table.build(Ephemeris(), start=start, end=end, step=step, workers=args.workers)
+    print(f"Position table for {start} to {end} ({len(table.values)} dates) written to {position_table.default_path()}")
+    return 0
+
+def run_command(args):
+    if args.cache_stats or args.cache_prune is not None:
+        return run_cache(args)
+    if args.build_positions is not None:
+        return run_build_positions(args)
+    if args.serve:
+        return run_server(args)
+    if args.jobs:
+        return run_batch(args)
+    return run_interactive()
+
+def run_interactive():
     if not show_welcome():
         return
     while True:
@@ -128,5 +246,23 @@ def main():
         else:
             print("Invalid choice. Please try again.\n")
 
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not args.profile:
+        return run_command(args)
+    from instrument import profiler
+    profiler.reset()
+    profiler.enable()
+    try:
+        return run_command(args)
+    finally:
+        if args.profile == "-":
+            print(profiler.report())
+        else:
+            profiler.dump(args.profile)
+            print(f"Profile written to {args.profile}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    sys.exit(main())
\ No newline at end of file
@@ -1,9 +1,18 @@
-"""Csv.py handles display of scaled data in tabular format."""
+"""Csv.py handles display and export of scaled data in tabular format."""
 import csv
 import os
 from datetime import timedelta
 from dateutil.relativedelta import relativedelta
 
+# Output formats by file extension; parquet and arrow need pyarrow
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
 class Csv:
     @staticmethod
     def calculate_delta(scale, duration, operation):
@@ -28,11 +37,16 @@ class Csv:
             return timedelta(hours=duration)
 
     @staticmethod
-    def prepare_and_export_data(scaled_values, scaling_ratios, scale, time_diff, scaling_mode, start_date, end_date):
-        """Display the scaled data in a tabular format on the command line."""
+    def prepare_and_export_data(scaled_values, scaling_ratios, scale, time_diff, scaling_mode, start_date, end_date,
+                                path=None):
+        """
+        Display the scaled data in a tabular format on the command line.
+        If `path` is given, the table is also written there (see `Csv.export_table`).
+        """
         # Assume operation is '+' for adding to start_date
+        from calendar_math import apply_offsets
         operation = "+"
-        scaled_dates = [start_date + Csv.calculate_delta(scale, value, operation) for value in scaled_values]
+        scaled_dates = apply_offsets(start_date, scaled_values, scale, operation).astype(object)
 
         print(f"\nStart Date: {start_date.strftime('%Y-%m-%d')}")
         print(f"End Date: {end_date.strftime('%Y-%m-%d')}")
@@ -43,4 +57,103 @@ class Csv:
         for scaled_date, duration, ratio in zip(scaled_dates, scaled_values, scaling_ratios):
             cycle_date = f"{start_date.strftime('%Y-%m-%d')} - {scaled_date.strftime('%Y-%m-%d')}"
             print(f"{cycle_date} | {int(round(duration))} | {ratio}")
-        print("\nData displayed successfully.")
\ No newline at end of file
+        print("\nData displayed successfully.")
+
+        if path:
+            import pandas as pd
+            table = pd.DataFrame({
+                "origin": [start_date] * len(scaled_values),
+                "end": [end_date] * len(scaled_values),
+                "scale": scale,
+                "time_diff": time_diff,
+                "scaling_mode": scaling_mode,
+                "ratio": list(scaling_ratios),
+                "duration": list(scaled_values),
+                "cycle_date": pd.to_datetime(list(scaled_dates)),
+            })
+            Csv.export_table(table, path)
+            print(f"Data exported to {path}")
+
+    @staticmethod
+    def build_cycle_table(origins, ends, scale, configurations=None, generations=1):
+        """
+        Build the scaled-date table for many origin/end pairs and every ratio set.
+
+        Each pair's time difference (the leading component in `scale`, as in the
+        interactive menu) is multiplied by every ratio of every set in
+        `configurations` (default: `scaling_configurations`). Internal division
+        ratios apply to the difference directly; extension ratios are chained,
+        each applied to the previous result, for `generations` generations
+        (see `scaling.project`).
+
+        Args:
+            origins (array-like): Origin dates.
+            ends (array-like): End dates, same length as `origins`.
+            scale (str): Time scale (years, months, weeks, days, hours).
+            configurations (dict): Scaling mode to {ratio set name: ratios}.
+            generations (int): Number of extension generations to project.
+
+        Returns:
+            DataFrame: One row per (pair, ratio, generation) with columns origin, end,
+            scale, time_diff, scaling_mode, ratio_set, ratio, generation, duration
+            and cycle_date.
+        """
+        import numpy as np
+        import pandas as pd
+        from calendar_math import apply_offsets, time_differences
+        from scaling import project
+
+        origins = np.atleast_1d(np.asarray(origins, dtype='datetime64[us]'))
+        ends = np.atleast_1d(np.asarray(ends, dtype='datetime64[us]'))
+        differences = time_differences(origins, ends)[scale]
+        time_diff = (differences[0] if isinstance(differences, tuple) else differences).astype(np.float64)
+
+        projection = project(time_diff, configurations, generations)
+        n_pairs, n_factors = projection.shape
+        durations = projection.values.ravel()
+        pair_origins = np.repeat(origins, n_factors)
+        return pd.DataFrame({
+            "origin": pair_origins,
+            "end": np.repeat(ends, n_factors),
+            "scale": pd.Categorical([scale] * (n_pairs * n_factors)),
+            "time_diff": np.repeat(time_diff, n_factors),
+            "scaling_mode": pd.Categorical(np.tile(projection.scaling_mode, n_pairs)),
+            "ratio_set": pd.Categorical(np.tile(projection.ratio_set, n_pairs)),
+            "ratio": np.tile(projection.ratio, n_pairs),
+            "generation": np.tile(projection.generation, n_pairs),
+            "duration": durations,
+            "cycle_date": apply_offsets(pair_origins, durations, scale, "+"),
+        })
+
+    @staticmethod
+    def export_table(table, path, fmt=None):
+        """
+        Write a table to CSV, Parquet or Arrow IPC (Feather) with columnar writers.
+
+        The format is taken from `fmt` ("csv", "parquet" or "arrow") or from the
+        file extension. Dates are formatted by the CSV writer in one pass rather
+        than per row; Parquet and Arrow keep them as native timestamps.
+        """
+        fmt = fmt or EXPORT_FORMATS.get(os.path.splitext(str(path))[1].lower())
+        if fmt not in EXPORT_FORMATS.values():
+            raise ValueError(f"Unsupported export format for {path}. Use .csv, .parquet or .arrow")
+        directory = os.path.dirname(str(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if fmt == "csv":
+            table.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M")
+            return
+        try:
+            if fmt == "parquet":
+                table.to_parquet(path, index=False)
+            else:
+                table.to_feather(path)
+        except ImportError as e:
+            raise ImportError(f"{fmt.title()} export requires pyarrow (pip install pyarrow)") from e
+
+    @staticmethod
+    def export_cycle_tables(origins, ends, scale, path, fmt=None, configurations=None, generations=1):
+        """Build the cycle table for many origin/end pairs and write it in one file."""
+        table = Csv.build_cycle_table(origins, ends, scale, configurations, generations)
+        Csv.export_table(table, path, fmt)
+        return table
\ No newline at end of file
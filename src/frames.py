@@ -0,0 +1,96 @@
+"""
+Reference frames for heliocentric longitudes.
+
+Ephemeris positions are on ICRS (equatorial) axes. Ecliptic longitudes are
+obtained by rotating those vectors with one 3x3 matrix per date:
+
+    icrs             no rotation (longitude measured along the ICRS equator)
+    ecliptic_j2000   mean ecliptic and equinox of J2000 (one constant matrix)
+    ecliptic_date    true ecliptic and equinox of date (IAU 2006/2000A
+                     precession-nutation, as astropy's true ecliptic frames)
+
+The of-date matrices are computed with ERFA for a whole date grid at once,
+cached per grid, and applied to the (3, n) position array with one batched
+matrix product, instead of an astropy frame transform per query.
+"""
+
+import hashlib
+from typing import Optional
+
+import erfa
+import numpy as np
+
+from memo import LRUCache
+
+FRAMES = ("icrs", "ecliptic_j2000", "ecliptic_date")
+
+# ICRS -> mean ecliptic and equinox of J2000
+J2000_ECLIPTIC_MATRIX = erfa.ecm06(2451545.0, 0.0)
+
+# Of-date matrices per (frame, time scale, date grid)
+_matrix_cache = LRUCache(maxsize=16)
+
+
+def check_frame(frame: str) -> str:
+    if frame not in FRAMES:
+        raise ValueError(f"Unknown frame {frame!r}. Use one of {', '.join(FRAMES)}")
+    return frame
+
+
+def _true_ecliptic_matrices(times) -> np.ndarray:
+    """(n, 3, 3) rotations from ICRS to the true ecliptic and equinox of each date."""
+    tt = times.tt
+    jd1, jd2 = np.atleast_1d(tt.jd1), np.atleast_1d(tt.jd2)
+    bias_precession_nutation = erfa.pnm06a(jd1, jd2)
+    _, nutation_obliquity = erfa.nut06a(jd1, jd2)
+    obliquity = erfa.obl06(jd1, jd2) + nutation_obliquity
+    c, s = np.cos(obliquity), np.sin(obliquity)
+    # Rotation about the x axis by the true obliquity (equator of date -> ecliptic of date)
+    to_ecliptic = np.zeros((len(jd1), 3, 3))
+    to_ecliptic[:, 0, 0] = 1.0
+    to_ecliptic[:, 1, 1] = c
+    to_ecliptic[:, 1, 2] = s
+    to_ecliptic[:, 2, 1] = -s
+    to_ecliptic[:, 2, 2] = c
+    return to_ecliptic @ bias_precession_nutation
+
+
+def rotation_matrices(frame: str, times) -> Optional[np.ndarray]:
+    """
+    Rotation from ICRS axes to `frame` for an astropy Time array.
+
+    Returns None for icrs, a single (3, 3) matrix for ecliptic_j2000 and an
+    (n, 3, 3) array for ecliptic_date, cached per date grid.
+    """
+    check_frame(frame)
+    if frame == "icrs":
+        return None
+    if frame == "ecliptic_j2000":
+        return J2000_ECLIPTIC_MATRIX
+    digest = hashlib.blake2b(
+        np.ascontiguousarray(times.jd1).tobytes() + np.ascontiguousarray(times.jd2).tobytes(), digest_size=16
+    ).hexdigest()
+    return _matrix_cache.get_or_compute((frame, times.scale, digest), lambda: _true_ecliptic_matrices(times))
+
+
+def rotation_matrices_jd(frame: str, jd) -> Optional[np.ndarray]:
+    """`rotation_matrices` for UTC Julian dates."""
+    if check_frame(frame) == "icrs":
+        return None
+    from astropy.time import Time
+    return rotation_matrices(frame, Time(np.asarray(jd, dtype=float), format='jd', scale='utc'))
+
+
+def rotate(xyz: np.ndarray, matrices: Optional[np.ndarray]) -> np.ndarray:
+    """Apply `rotation_matrices` output to a (3, n) position array."""
+    if matrices is None:
+        return xyz
+    if matrices.ndim == 2:
+        return matrices @ xyz
+    return np.einsum('nij,jn->in', matrices, xyz)
+
+
+def longitudes(xyz: np.ndarray, matrices: Optional[np.ndarray] = None) -> np.ndarray:
+    """Longitudes in degrees (0-360) of a (3, n) position array in the rotated frame."""
+    x, y, _ = rotate(xyz, matrices)
+    return np.degrees(np.arctan2(y, x)) % 360
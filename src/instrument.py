@@ -0,0 +1,101 @@
+"""
+Lightweight instrumentation for the astro pipeline.
+
+The module-level `profiler` collects wall time per stage and named counters
+when enabled. When disabled (the default), `stage()` returns a shared no-op
+context and `count()` returns immediately, so instrumented hot paths pay only
+a method call.
+"""
+
+import json
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.timings: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.timings.clear()
+            self.calls.clear()
+            self.counters.clear()
+
+    def stage(self, name: str):
+        """Context manager timing one stage; a no-op when profiling is disabled."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1):
+        """Add `n` to a named counter; a no-op when profiling is disabled."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _record(self, name: str, seconds: float):
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def summary(self) -> dict:
+        """Per-stage total seconds and call counts, plus counters."""
+        with self._lock:
+            return {
+                "stages": {
+                    name: {"seconds": self.timings[name], "calls": self.calls[name]}
+                    for name in sorted(self.timings, key=self.timings.get, reverse=True)
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def report(self) -> str:
+        """Human-readable per-stage breakdown."""
+        summary = self.summary()
+        lines = ["Profile:", f"{'stage':28s} {'calls':>8s} {'total ms':>12s}"]
+        for name, stage in summary["stages"].items():
+            lines.append(f"{name:28s} {stage['calls']:8d} {stage['seconds'] * 1000:12.1f}")
+        if summary["counters"]:
+            lines.append("Counters:")
+            lines += [f"{name:28s} {value:8d}" for name, value in summary["counters"].items()]
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Write the summary as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+profiler = Profiler()
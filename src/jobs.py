@@ -0,0 +1,200 @@
+"""
+Non-interactive batch job runner.
+
+Runs many time-difference, date-offset, sidereal, synodic and planet-position
+queries from a JSON or CSV job file in one warm process. Astro jobs share a
+single Ephemeris instance (and so its memo and longitude store), independent
+jobs run concurrently on a thread pool, and each job writes one result file.
+
+JSON job files hold a list of job objects (or {"jobs": [...]}); CSV job files
+have one job per row with the same field names as columns. Fields:
+
+    id          Job name, used for the result file name (defaults to the row number);
+                unique, and a plain file name without path separators
+    type        time_difference, date_offset, sidereal, synodic or position
+    start, end  Dates (time_difference, sidereal, synodic)
+    date        Date (date_offset origin, position)
+    scale       years, months, weeks, days or hours (time_difference, date_offset)
+    duration    Offset amount (date_offset)
+    operation   + or - (date_offset, default +)
+    bodies      Body names, as a list or separated by commas/semicolons
+    step        Step in days (sidereal, synodic; default 7)
+    frame       Longitude frame: icrs, ecliptic_j2000 or ecliptic_date (astro jobs; default icrs)
+    tolerance   Sample adaptively to this accuracy in degrees and interpolate onto the step grid (sidereal)
+"""
+
+import csv
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%m/%d/%Y", "%d-%m-%Y"]
+PLANETS = ['mercury', 'venus', 'earth', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune']
+JOB_TYPES = ["time_difference", "date_offset", "sidereal", "synodic", "position"]
+
+
+def parse_date(value: str) -> datetime:
+    """Parse a job date in any of the formats accepted by the interactive prompts."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value}")
+
+
+def parse_bodies(value) -> List[str]:
+    """Body names from a list or a comma/semicolon separated string."""
+    if isinstance(value, (list, tuple)):
+        return [str(b).strip().lower() for b in value if str(b).strip()]
+    return [b.strip().lower() for b in re.split(r"[;,]", value or "") if b.strip()]
+
+
+def load_jobs(path) -> List[dict]:
+    """
+    Read jobs from a JSON or CSV file, giving each job an `id`. Raises ValueError for
+    duplicate ids and ids that are not plain file names.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="") as f:
+            jobs = [{k: v for k, v in row.items() if v not in (None, "")} for row in csv.DictReader(f)]
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        jobs = data["jobs"] if isinstance(data, dict) else data
+    seen = set()
+    for n, job in enumerate(jobs, start=1):
+        job["id"] = str(job.get("id", f"job{n}"))
+        if job["id"] in ("", ".", "..") or re.search(r"[/\\:\0]", job["id"]):
+            raise ValueError(f"Job {job['id']!r}: the id must be a plain file name, without path separators")
+        if job["id"] in seen:
+            raise ValueError(f"Job {job['id']}: duplicate id; each job writes its own result file")
+        seen.add(job["id"])
+        if job.get("type") not in JOB_TYPES:
+            raise ValueError(f"Job {job['id']}: invalid type {job.get('type')!r}. Use one of {', '.join(JOB_TYPES)}")
+    return jobs
+
+
+class JobRunner:
+    def __init__(self, output_dir, workers: int = 4, ephemeris=None):
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.workers = max(1, workers)
+        self._ephemeris = ephemeris
+        self._lock = threading.Lock()
+
+    @property
+    def ephemeris(self):
+        """Shared Ephemeris, created on the first astro job."""
+        with self._lock:
+            if self._ephemeris is None:
+                from astro import Ephemeris
+                self._ephemeris = Ephemeris()
+            return self._ephemeris
+
+    def run(self, jobs: List[dict]) -> List[dict]:
+        """
+        Run all jobs and write one result file per job plus `summary.json`.
+        A failing job is recorded in the summary and does not stop the others.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            summary = list(pool.map(self._run_safely, jobs))
+        with open(self.output_dir / "summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def _run_safely(self, job: dict) -> dict:
+        try:
+            path = self.run_job(job)
+            return {"id": job["id"], "type": job["type"], "status": "ok", "output": str(path)}
+        except Exception as e:
+            logger.error("Job %s failed: %s", job["id"], e)
+            return {"id": job["id"], "type": job["type"], "status": "error", "error": str(e)}
+
+    def compute(self, job: dict):
+        """Result of one job: a dict row for time jobs, a DataFrame for astro jobs."""
+        job_type = job["type"]
+        if job_type == "time_difference":
+            return self.time_difference(job)
+        if job_type == "date_offset":
+            return self.date_offset(job)
+        return self.astro(job)
+
+    def run_job(self, job: dict) -> Path:
+        """Run one job and return the path of its result file."""
+        path = self.output_dir / f"{job['id']}.csv"
+        result = self.compute(job)
+        if isinstance(result, dict):
+            self._write_rows(path, result)
+        else:
+            result.to_csv(path)
+        return path
+
+    @staticmethod
+    def _write_rows(path: Path, row: dict):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            writer.writeheader()
+            writer.writerow(row)
+
+    @staticmethod
+    def time_difference(job: dict) -> dict:
+        from calculations import Calculations
+        start, end = parse_date(job["start"]), parse_date(job["end"])
+        scale = job.get("scale", "days")
+        result = Calculations.calculate_time_difference(start, end, scale)
+        if result is None:
+            raise ValueError(f"Invalid scale: {scale}")
+        labels = {
+            "years": ["years", "months", "days"],
+            "months": ["months", "days"],
+            "weeks": ["weeks", "days"],
+            "days": ["days", "hours"],
+            "hours": ["hours"],
+        }[scale]
+        values = result if isinstance(result, tuple) else (result,)
+        return {"start": start.isoformat(), "end": end.isoformat(), **dict(zip(labels, values))}
+
+    @staticmethod
+    def date_offset(job: dict) -> dict:
+        from calculations import Calculations
+        origin = parse_date(job["date"])
+        scale = job["scale"]
+        duration = float(job["duration"])
+        operation = job.get("operation", "+")
+        delta = Calculations.calculate_delta(scale, duration, operation)
+        if delta is None:
+            raise ValueError(f"Invalid scale: {scale}")
+        return {"origin": origin.isoformat(), "scale": scale, "duration": duration,
+                "operation": operation, "date": (origin + delta).strftime('%Y-%m-%d %H:%M')}
+
+    def astro(self, job: dict):
+        eph = self.ephemeris
+        job_type = job["type"]
+        frame = job.get("frame", "icrs")
+        if job_type == "position":
+            date = parse_date(job["date"]).strftime('%Y-%m-%d')
+            bodies = parse_bodies(job.get("bodies")) or PLANETS
+            return eph.calculate_longitudes_and_synodic_angles(date, date, bodies, step=1, frame=frame)
+        start = parse_date(job["start"]).strftime('%Y-%m-%d')
+        end = parse_date(job["end"]).strftime('%Y-%m-%d')
+        bodies = parse_bodies(job.get("bodies"))
+        step = float(job.get("step", 7))
+        if job_type == "sidereal":
+            tolerance = float(job["tolerance"]) if job.get("tolerance") else None
+            return eph.calculate_longitudes_and_synodic_angles(start, end, bodies, step, frame=frame,
+                                                               tolerance=tolerance)
+        return eph.calculate_synodic_period(start, end, bodies=bodies, step=step, frame=frame)
+
+
+def run_jobs(path, output_dir, workers: int = 4, ephemeris: Optional[object] = None) -> List[dict]:
+    """Load a job file and run every job in it."""
+    return JobRunner(output_dir, workers=workers, ephemeris=ephemeris).run(load_jobs(path))
@@ -0,0 +1,195 @@
+"""
+Columnar, range-extending store of heliocentric longitudes.
+
+Longitudes are kept per body and per sampling grid as fixed-size `.npy`
+segments. A grid is identified by its step and its phase (the offset of its
+sample times modulo the step), so every sample of a grid has a stable integer
+index `k`, with Julian date `UNIX_EPOCH_JD + (phase + k * step) / 1 day`.
+Samples that have not been computed yet hold NaN. A query loads the segments
+it touches as memory maps and only computes the samples that are missing.
+Reads within one segment are zero-copy views; reads across segments copy.
+Segment updates hold a per-segment file lock, so one store can be shared by
+threads and processes without further locking.
+
+Samples whose computation failed (NaN from `compute`) are not written to disk,
+where they would be indistinguishable from missing ones, but remembered in a
+per-store mask so repeat queries do not compute them again; `reset_failures`
+forgets them (e.g. after installing a kernel).
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from cache import CacheManager, atomic_write, file_lock
+from instrument import profiler
+
+logger = logging.getLogger(__name__)
+
+NS_PER_DAY = 86400 * 10**9
+
+
+class LongitudeStore:
+    def __init__(self, directory: Path, segment_size: int = 4096, cache: Optional[CacheManager] = None):
+        """
+        Args:
+            directory (Path): Root directory of the segments.
+            segment_size (int): Samples per segment file.
+            cache (CacheManager): Manager that tracks segment accesses and evicts old
+                segments to its byte budget (optional).
+        """
+        self.directory = Path(directory)
+        self.segment_size = int(segment_size)
+        self.cache = cache
+        # Segment path -> mask of samples whose computation failed in this process
+        self._failed: Dict[Path, np.ndarray] = {}
+        self._failed_lock = threading.Lock()
+
+    def reset_failures(self):
+        """Forget failed samples so the next query computes them again."""
+        with self._failed_lock:
+            self._failed.clear()
+
+    def _grid_dir(self, body: str, step_ns: int, phase_ns: int, frame: str = "icrs") -> Path:
+        # ICRS longitudes keep the original layout; other frames get their own subtree
+        root = self.directory if frame == "icrs" else self.directory / frame
+        return root / body / f"step{step_ns}" / f"phase{phase_ns}"
+
+    def _load_segment(self, path: Path):
+        """Memory-map a segment, or return None if it does not exist or is unreadable."""
+        if not path.exists():
+            return None
+        try:
+            values = np.load(path, mmap_mode='r')
+        except Exception as e:
+            logger.warning("Longitude segment load failed for %s: %s", path, e)
+            return None
+        if self.cache is not None:
+            self.cache.touch(path)
+        return values
+
+    def _save_segment(self, path: Path, values: np.ndarray):
+        """Write a segment to a temporary file and rename it into place."""
+        atomic_write(path, lambda f: np.save(f, values))
+
+    def longitudes(
+            self,
+            dates,
+            bodies: List[str],
+            step: float,
+            compute: Callable[[object, List[str]], np.ndarray],
+            frame: str = "icrs"
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return longitudes for each body on a regular date grid.
+
+        Args:
+            dates: Regular grid of dates (e.g. a pandas DatetimeIndex) with spacing `step`.
+            bodies (list): Body names.
+            step (float): Grid spacing in days.
+            compute (callable): `compute(dates_subset, bodies_subset)` returning an array of
+                shape (len(dates_subset), len(bodies_subset)) for the samples that are missing.
+            frame (str): Frame the longitudes are measured in; each frame is stored separately.
+
+        Returns:
+            dict: Body name to longitude array. Only a body whose range is fully cached
+            within a single segment is returned without copying, as a read-only
+            memory-mapped view; a range spanning several segments is concatenated into
+            a new array, and one with missing samples is a new array as well.
+        """
+        ns = np.asarray(dates, dtype='datetime64[ns]').astype(np.int64)
+        if len(ns) == 0:
+            return {body: np.empty(0) for body in bodies}
+        step_ns = int(round(step * NS_PER_DAY))
+        phase_ns = int(ns[0] % step_ns)
+        k = (ns - phase_ns) // step_ns
+        size = self.segment_size
+        segments = np.arange(k[0] // size, k[-1] // size + 1)
+
+        result = {}
+        unknown = {}
+        missing = np.zeros(len(k), dtype=bool)
+        with profiler.stage("longitude_store_load"):
+            for body in bodies:
+                grid_dir = self._grid_dir(body, step_ns, phase_ns, frame)
+                parts, failed = [], []
+                for segment in segments:
+                    lo = max(k[0], segment * size) - segment * size
+                    hi = min(k[-1], segment * size + size - 1) - segment * size + 1
+                    path = grid_dir / f"{segment}.npy"
+                    values = self._load_segment(path)
+                    parts.append(values[lo:hi] if values is not None else np.full(hi - lo, np.nan))
+                    with self._failed_lock:
+                        mask = self._failed.get(path)
+                    failed.append(mask[lo:hi] if mask is not None else np.zeros(hi - lo, dtype=bool))
+                result[body] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+                # Samples neither stored nor known to fail
+                unknown[body] = np.isnan(result[body]) & ~np.concatenate(failed)
+                missing |= unknown[body]
+
+        n_missing = int(missing.sum())
+        profiler.count("longitude_store_hits", len(k) - n_missing)
+        profiler.count("longitude_store_misses", n_missing)
+        if not n_missing:
+            return result
+
+        # Compute only the missing samples, for the bodies that lack any of them
+        pending = [body for body in bodies if unknown[body][missing].any()]
+        index = np.flatnonzero(missing)
+        logger.debug("Computing %d missing samples for %s", len(index), pending)
+        computed = compute(dates[index], pending)
+        saved = []
+        for j, body in enumerate(pending):
+            values = np.array(result[body])
+            values[index] = computed[:, j]
+            result[body] = values
+            ok = ~np.isnan(computed[:, j])
+            if not ok.all():
+                self._record_failures(body, step_ns, phase_ns, k[index[~ok]], frame)
+            if ok.any():
+                with profiler.stage("longitude_store_save"):
+                    saved += self._store(body, step_ns, phase_ns, k[index[ok]], computed[ok, j], frame)
+        # One manifest update (and eviction pass) for every segment written by this call
+        if self.cache is not None and saved:
+            try:
+                self.cache.record(*saved)
+            except Exception as e:
+                logger.warning("Cache manifest update failed: %s", e)
+        return result
+
+    def _record_failures(self, body: str, step_ns: int, phase_ns: int, k: np.ndarray, frame: str = "icrs"):
+        """Remember samples whose computation failed, per segment."""
+        grid_dir = self._grid_dir(body, step_ns, phase_ns, frame)
+        size = self.segment_size
+        with self._failed_lock:
+            for segment in np.unique(k // size):
+                path = grid_dir / f"{segment}.npy"
+                mask = self._failed.setdefault(path, np.zeros(size, dtype=bool))
+                mask[k[(k // size) == segment] - segment * size] = True
+
+    def _store(self, body: str, step_ns: int, phase_ns: int, k: np.ndarray, values: np.ndarray,
+               frame: str = "icrs") -> List[Path]:
+        """
+        Merge newly computed samples into their segments and return the paths written.
+        Each read-modify-write holds the segment's file lock, so concurrent processes do
+        not drop each other's samples.
+        """
+        grid_dir = self._grid_dir(body, step_ns, phase_ns, frame)
+        size = self.segment_size
+        saved = []
+        for segment in np.unique(k // size):
+            mask = (k // size) == segment
+            path = grid_dir / f"{segment}.npy"
+            try:
+                with file_lock(path):
+                    existing = self._load_segment(path)
+                    data = np.array(existing) if existing is not None else np.full(size, np.nan)
+                    data[k[mask] - segment * size] = values[mask]
+                    self._save_segment(path, data)
+                saved.append(path)
+            except Exception as e:
+                logger.warning("Longitude segment failed to save for %s: %s", path, e)
+        return saved
@@ -0,0 +1,121 @@
+"""
+Bounded in-process memo with an optional on-disk tier.
+"""
+
+import logging
+import shelve
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+
+class LRUCache:
+    """
+    Fixed-size mapping that evicts the least recently used entry ("lru") or the
+    oldest inserted entry ("fifo") once `maxsize` is reached.
+
+    If `disk_path` is given, misses in memory are looked up in a shelve file
+    before computing, and computed values are written there too. The disk tier
+    is not bounded; it only saves recomputation across processes. Under the cache
+    directory it lives in `memo/`, which the cache manager never evicts.
+    """
+
+    def __init__(self, maxsize: int = 4096, policy: str = "lru", disk_path: Optional[Path] = None):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy: {policy}. Use one of {', '.join(EVICTION_POLICIES)}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.disk_path = Path(disk_path) if disk_path else None
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._disk = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def _disk_key(self, key: Hashable) -> str:
+        return repr(key)
+
+    def _open_disk(self):
+        if self._disk is None and self.disk_path is not None:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._disk = shelve.open(str(self.disk_path))
+        return self._disk
+
+    def _put(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                if self.policy == "lru":
+                    self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+            disk = self._open_disk()
+            if disk is not None:
+                try:
+                    value = disk[self._disk_key(key)]
+                    self.disk_hits += 1
+                    self._put(key, value)
+                    return value
+                except KeyError:
+                    pass
+                except Exception as e:
+                    logger.warning("Memo disk tier read failed: %s", e)
+
+        value = compute()
+
+        with self._lock:
+            self._put(key, value)
+            disk = self._open_disk()
+            if disk is not None:
+                try:
+                    disk[self._disk_key(key)] = value
+                except Exception as e:
+                    logger.warning("Memo disk tier write failed: %s", e)
+        return value
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters plus the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop all in-memory entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+    def close(self):
+        """Close the disk tier, if open."""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def __len__(self) -> int:
+        return len(self._data)
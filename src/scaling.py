@@ -0,0 +1,108 @@
+"""Scaling.py projects base intervals through the ratio sets in scales.py with NumPy broadcasting."""
+import numpy as np
+from scales import scaling_configurations
+
+
+def scaling_factors(configurations=None, generations=1):
+    """
+    Flatten ratio sets into one factor per projected value.
+
+    Internal division ratios apply to the interval directly. Extension ratios
+    are chained (a cumulative product), and each further generation repeats the
+    chain starting from the previous generation's last value.
+
+    Args:
+        configurations (dict): Scaling mode to {ratio set name: ratios}
+            (default: `scaling_configurations`).
+        generations (int): Number of extension generations to project.
+
+    Returns:
+        dict: Column arrays "scaling_mode", "ratio_set", "ratio", "generation" and "factor".
+    """
+    if generations < 1:
+        raise ValueError("`generations` must be at least 1")
+    configurations = configurations or scaling_configurations
+    columns = {"scaling_mode": [], "ratio_set": [], "ratio": [], "generation": [], "factor": []}
+    for mode, ratio_sets in configurations.items():
+        for name, ratios in ratio_sets.items():
+            ratios = np.asarray(ratios, dtype=np.float64)
+            if mode == "extension":
+                chain = np.cumprod(ratios)
+                # Generation g starts from chain[-1] ** (g - 1)
+                levels = np.arange(generations)
+                factors = (chain[-1] ** levels)[:, None] * chain[None, :]
+                n_gen = generations
+            else:
+                factors = ratios[None, :]
+                n_gen = 1
+            columns["scaling_mode"] += [mode] * factors.size
+            columns["ratio_set"] += [name] * factors.size
+            columns["ratio"].append(np.tile(ratios, n_gen))
+            columns["generation"].append(np.repeat(np.arange(1, n_gen + 1), len(ratios)))
+            columns["factor"].append(factors.ravel())
+    for key in ("ratio", "generation", "factor"):
+        columns[key] = np.concatenate(columns[key])
+    columns["scaling_mode"] = np.array(columns["scaling_mode"], dtype=object)
+    columns["ratio_set"] = np.array(columns["ratio_set"], dtype=object)
+    return columns
+
+
+class ScalingProjection:
+    """
+    Projection of N base intervals through M scaling factors.
+
+    `values` is the (N x M) matrix `intervals[:, None] * factor[None, :]`; the
+    other attributes label its columns.
+    """
+
+    def __init__(self, intervals, configurations=None, generations=1):
+        self.intervals = np.atleast_1d(np.asarray(intervals, dtype=np.float64))
+        columns = scaling_factors(configurations, generations)
+        self.scaling_mode = columns["scaling_mode"]
+        self.ratio_set = columns["ratio_set"]
+        self.ratio = columns["ratio"]
+        self.generation = columns["generation"]
+        self.factor = columns["factor"]
+        self.values = self.intervals[:, None] * self.factor[None, :]
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def select(self, scaling_mode=None, ratio_set=None):
+        """Column mask for a scaling mode and/or ratio set."""
+        mask = np.ones(len(self.factor), dtype=bool)
+        if scaling_mode is not None:
+            mask &= self.scaling_mode == scaling_mode
+        if ratio_set is not None:
+            mask &= self.ratio_set == ratio_set
+        return mask
+
+    def to_frame(self):
+        """Long-format DataFrame with one row per (interval, factor)."""
+        import pandas as pd
+        n, m = self.values.shape
+        return pd.DataFrame({
+            "interval": np.repeat(self.intervals, m),
+            "scaling_mode": pd.Categorical(np.tile(self.scaling_mode, n)),
+            "ratio_set": pd.Categorical(np.tile(self.ratio_set, n)),
+            "ratio": np.tile(self.ratio, n),
+            "generation": np.tile(self.generation, n),
+            "factor": np.tile(self.factor, n),
+            "value": self.values.ravel(),
+        })
+
+
+def project(intervals, configurations=None, generations=1):
+    """Project base intervals through every ratio set; see `ScalingProjection`."""
+    return ScalingProjection(intervals, configurations, generations)
+
+
+def scale_values(time_diff, ratios, scaling_mode):
+    """
+    Scaled values for a single interval and ratio list, as used by the menus.
+    Extension ratios are chained; any other mode applies each ratio directly.
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+    factors = np.cumprod(ratios) if scaling_mode == "extension" else ratios
+    return (float(time_diff) * factors).tolist()
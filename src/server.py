@@ -0,0 +1,215 @@
+"""
+Warm local ephemeris service.
+
+`serve()` runs a localhost HTTP server that keeps one `Ephemeris` (and so its
+memo, longitude store and loaded kernels) in memory and answers the same
+queries as the batch job runner (see jobs.py) with millisecond latency:
+
+    GET  /health    Service counters
+    POST /query     A job object, e.g. {"type": "synodic", "start": "2000-01-01",
+                    "end": "2001-01-01", "bodies": "mars,venus", "step": 7}
+
+Identical requests that arrive while one is being computed wait for that
+computation instead of repeating it. Sidereal and position requests go
+through the longitude store one at a time, so an overlapping request only
+computes the dates the earlier one did not cover.
+
+`ServiceClient` is the thin client used by the CLI when a server is running.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib import request
+from urllib.error import HTTPError, URLError
+
+from jobs import JobRunner, PLANETS, parse_bodies, parse_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def server_address() -> Tuple[str, int]:
+    """Address from $PLATINUM_SERVER ("host:port" or "port"), or the default."""
+    value = os.environ.get("PLATINUM_SERVER", "")
+    host, _, port = value.rpartition(":")
+    return host or DEFAULT_HOST, int(port) if port else DEFAULT_PORT
+
+
+def encode_result(result) -> dict:
+    """JSON form of a job result: a row dict, or a DataFrame in pandas "split" layout."""
+    if isinstance(result, dict):
+        return {"row": result}
+    return {"frame": json.loads(result.to_json(orient="split", date_format="iso", date_unit="s"))}
+
+
+def decode_result(payload: dict):
+    """Inverse of `encode_result`."""
+    if "row" in payload:
+        return payload["row"]
+    import pandas as pd
+    frame = payload["frame"]
+    index = pd.to_datetime(frame["index"]) if frame["index"] else None
+    return pd.DataFrame(frame["data"], index=index, columns=frame["columns"])
+
+
+class EphemerisService:
+    def __init__(self, ephemeris=None):
+        self.runner = JobRunner(output_dir=None, ephemeris=ephemeris)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pid": os.getpid(), "requests": self.requests, "computed": self.computed,
+                    "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+    def query(self, job: dict):
+        """
+        Result of one job. Concurrent requests for the same job share a single computation.
+        """
+        key = json.dumps({k: v for k, v in job.items() if k != "id"}, sort_keys=True, default=str)
+        with self._lock:
+            self.requests += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            future.set_result(self._compute(job))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self.computed += 1
+                del self._inflight[key]
+        return future.result()
+
+    def _compute(self, job: dict):
+        if job.get("type") == "sidereal" and job.get("tolerance"):
+            # Adaptive sampling computes its own dates instead of reading the step grid from the store
+            return self.runner.compute(job)
+        if job.get("type") in ("sidereal", "position"):
+            return self._longitudes_and_angles(job)
+        return self.runner.compute(job)
+
+    def _longitudes_and_angles(self, job: dict):
+        """Sidereal/position results built from the longitude store, so overlapping ranges are reused."""
+        import numpy as np
+        import pandas as pd
+        from synodic import SynodicTable
+        eph = self.runner.ephemeris
+        if job["type"] == "position":
+            start = end = parse_date(job["date"]).strftime('%Y-%m-%d')
+            bodies = parse_bodies(job.get("bodies")) or PLANETS
+            step = 1.0
+        else:
+            start = parse_date(job["start"]).strftime('%Y-%m-%d')
+            end = parse_date(job["end"]).strftime('%Y-%m-%d')
+            bodies = parse_bodies(job.get("bodies"))
+            step = float(job.get("step", 7))
+        frame = job.get("frame", "icrs")
+        dates = pd.date_range(start=start, end=end, freq=f'{step}D')
+        if dates.empty or not bodies:
+            return pd.DataFrame()
+        # No service-wide lock: the store serializes its own segment updates, so
+        # concurrent requests only wait for each other on the segments they share
+        longitudes = eph.longitude_store.longitudes(
+            dates, bodies, step, partial(eph.get_heliocentric_longitudes_batch, frame=frame), frame=frame
+        )
+        values = np.column_stack([longitudes[body] for body in bodies])
+        return SynodicTable.from_longitudes(dates, bodies, values).to_frame()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: EphemerisService = None
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok", **self.service.stats()})
+        else:
+            self._reply(404, {"status": "error", "error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/query":
+            self._reply(404, {"status": "error", "error": f"Unknown path {self.path}"})
+            return
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            result = self.service.query(job)
+        except Exception as e:
+            logger.warning("Query failed: %s", e)
+            self._reply(400, {"status": "error", "error": str(e)})
+            return
+        self._reply(200, {"status": "ok", **encode_result(result)})
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ephemeris=None) -> ThreadingHTTPServer:
+    """Build (but do not start) the HTTP server; port 0 picks a free port."""
+    handler = type("Handler", (_Handler,), {"service": EphemerisService(ephemeris)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ephemeris=None):
+    """Run the service until interrupted."""
+    server = make_server(host, port, ephemeris)
+    logger.info("Ephemeris service listening on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class ServiceClient:
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, timeout: float = 300.0):
+        default_host, default_port = server_address()
+        self.url = f"http://{host or default_host}:{port or default_port}"
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        """Whether a server answers at this address."""
+        try:
+            with request.urlopen(self.url + "/health", timeout=0.25) as response:
+                return response.status == 200
+        except (URLError, OSError, ValueError):
+            return False
+
+    def query(self, job: dict):
+        """Run a job on the server; raises ValueError with the server's message if it fails."""
+        req = request.Request(self.url + "/query", data=json.dumps(job).encode(),
+                              headers={"Content-Type": "application/json"})
+        try:
+            with request.urlopen(req, timeout=self.timeout) as response:
+                payload = json.loads(response.read())
+        except HTTPError as e:
+            raise ValueError(json.loads(e.read()).get("error", str(e))) from None
+        return decode_result(payload)
@@ -0,0 +1,170 @@
+"""
+Accuracy-tiered ephemeris source selection.
+
+The ephemeris tiers, cheapest first, are:
+
+    chebyshev   fitted coefficients (only with `Ephemeris(use_chebyshev=True)`)
+    builtin     astropy's builtin ephemeris (ERFA epv00/plan94)
+    de440       JPL DE440, the reference
+
+`source_accuracy.json` lists, per tier and body, epoch ranges with the largest
+heliocentric longitude error (arcseconds) against DE440. It is regenerated
+offline by `benchmarks/validate_sources.py`. A caller that passes a required
+accuracy gets the cheapest tier validated to meet it over the whole query.
+
+`SourceSelector` also remembers, per body and century, which tiers failed, so
+repeat queries skip a source that is known not to work (e.g. de440 without
+the kernel, or a body the builtin ephemeris does not have) instead of paying
+for a failing computation again.
+"""
+
+import json
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chebyshev import UNIX_EPOCH_JD
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("chebyshev", "builtin", "de440")
+# Tiers tried when no accuracy is requested (the historical builtin -> de440 fallback)
+DEFAULT_SOURCES = ("builtin", "de440")
+ACCURACY_TABLE = Path(__file__).resolve().parent / "source_accuracy.json"
+J2000_JD = 2451545.0
+# Granularity of the failure and choice memo
+EPOCH_DAYS = 36525.0
+
+
+def date_to_jd(value: str) -> float:
+    """
+    Julian date of 0h UTC on a table date ("YYYY-MM-DD"). Day precision keeps the
+    full DE440 span (1550-2650), which does not fit in nanosecond datetimes.
+    """
+    days = (np.datetime64(value, 'D') - np.datetime64('1970-01-01', 'D')).astype(np.int64)
+    return float(days) + UNIX_EPOCH_JD
+
+
+def jd_to_date(jd: float) -> str:
+    """Inverse of `date_to_jd`, for the day containing `jd`."""
+    return str(np.datetime64('1970-01-01', 'D') + np.int64(np.floor(jd - UNIX_EPOCH_JD)))
+
+
+@lru_cache(maxsize=4)
+def load_accuracy_table(path=ACCURACY_TABLE) -> Dict[str, Dict[str, List[Tuple[float, float, float]]]]:
+    """
+    Validation table as {tier: {body: [(start_jd, end_jd, max_error_arcsec), ...]}},
+    ranges sorted by start.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    table = {}
+    for tier, bodies in data["tiers"].items():
+        table[tier] = {}
+        for body, entries in bodies.items():
+            ranges = [
+                (date_to_jd(e["start"]), date_to_jd(e["end"]), float(e["max_error_arcsec"]))
+                for e in entries
+            ]
+            table[tier][body.lower()] = sorted(ranges)
+    return table
+
+
+def max_error(table: dict, tier: str, body: str, start_jd: float, end_jd: float) -> Optional[float]:
+    """
+    Largest validated error (arcseconds) of `tier` for `body` between two Julian dates,
+    or None if the validated ranges do not cover the whole span.
+    """
+    covered_to = start_jd
+    worst = None
+    for first, last, error in table.get(tier, {}).get(body.lower(), []):
+        if last < start_jd or first > end_jd:
+            continue
+        if first > covered_to:
+            return None
+        covered_to = max(covered_to, last)
+        worst = error if worst is None else max(worst, error)
+    return worst if covered_to >= end_jd else None
+
+
+def epochs(jd) -> Tuple[int, ...]:
+    """Centuries (relative to J2000) touched by a set of Julian dates."""
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    if not len(jd):
+        return ()
+    first, last = np.floor((np.array([jd.min(), jd.max()]) - J2000_JD) / EPOCH_DAYS).astype(int)
+    return tuple(range(first, last + 1))
+
+
+class SourceSelector:
+    def __init__(self, table_path=ACCURACY_TABLE):
+        self.table_path = table_path
+        self._failed = set()
+        self._chosen: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> dict:
+        return load_accuracy_table(self.table_path)
+
+    def validated(self, body: str, jd, accuracy: float, tiers: Sequence[str] = TIERS) -> List[str]:
+        """Tiers (in the given order) whose validated error for `body` over `jd` is within `accuracy` arcseconds."""
+        jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+        start, end = float(jd.min()), float(jd.max())
+        result = []
+        for tier in tiers:
+            error = max_error(self.table, tier, body, start, end)
+            if error is not None and error <= accuracy:
+                result.append(tier)
+        return result
+
+    def candidates(self, body: str, jd, accuracy: Optional[float] = None,
+                   tiers: Sequence[str] = DEFAULT_SOURCES) -> List[str]:
+        """
+        Tiers to try for `body` at Julian dates `jd`, cheapest first, without those known
+        to fail there. With `accuracy` (arcseconds) only validated tiers are returned,
+        and a ValueError is raised if no tier is validated to that accuracy.
+        """
+        if accuracy is not None:
+            validated = self.validated(body, jd, accuracy, tiers)
+            if not validated:
+                raise ValueError(
+                    f"No ephemeris source is validated to {accuracy} arcsec for {body} over the requested dates"
+                )
+            tiers = validated
+        touched = epochs(jd)
+        with self._lock:
+            result = [t for t in tiers if not any((t, body, epoch) in self._failed for epoch in touched)]
+            chosen = {self._chosen.get((body, epoch, accuracy)) for epoch in touched}
+        # A tier that already worked over every touched century is tried first
+        if len(chosen) == 1:
+            tier = chosen.pop()
+            if tier in result:
+                result.remove(tier)
+                result.insert(0, tier)
+        return result
+
+    def record_failure(self, tier: str, body: str, jd):
+        with self._lock:
+            for epoch in epochs(jd):
+                self._failed.add((tier, body, epoch))
+        logger.debug("Ephemeris source %s marked as failing for %s", tier, body)
+
+    def record_success(self, tier: str, body: str, jd, accuracy: Optional[float] = None):
+        with self._lock:
+            for epoch in epochs(jd):
+                self._chosen[(body, epoch, accuracy)] = tier
+
+    def reset(self):
+        """Forget failures and choices, e.g. after installing a kernel."""
+        with self._lock:
+            self._failed.clear()
+            self._chosen.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"failed": sorted(self._failed), "chosen": dict(self._chosen)}
@@ -0,0 +1,187 @@
+"""
+Memory-mapped reader for JPL SPK kernels (e.g. de440.bsp).
+
+Only what the ephemeris fallback needs is supported: DAF files in either byte
+order, with type 2 (Chebyshev position) segments. The file is mapped read-only
+and opened once per process (see `open_kernel`); segment coefficients are
+NumPy views into the map, so every `Ephemeris` instance shares them and pool
+workers share the operating system's page cache instead of loading copies.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD_BYTES = 1024
+SECONDS_PER_DAY = 86400.0
+J2000_JD = 2451545.0
+
+# NAIF IDs used for body names, matching astropy's kernel chains: planets with a
+# body centre in DE kernels use it, the outer planets use their barycentre
+BODY_IDS = {
+    'sun': 10,
+    'mercury': 199,
+    'venus': 299,
+    'earth': 399,
+    'moon': 301,
+    'earth-moon-barycenter': 3,
+    'mars': 4,
+    'jupiter': 5,
+    'saturn': 6,
+    'uranus': 7,
+    'neptune': 8,
+    'pluto': 9,
+}
+
+
+class SPKSegment:
+    """
+    One type 2 segment: Chebyshev coefficients for the position of `target`
+    relative to `center`, in km, over equal-length records.
+    """
+
+    def __init__(self, target: int, center: int, frame: int, start_et: float, end_et: float, data: np.ndarray):
+        self.target = target
+        self.center = center
+        self.frame = frame
+        self.start_et = start_et
+        self.end_et = end_et
+        init, interval, record_size, n_records = data[-4:]
+        self.init = float(init)
+        self.interval = float(interval)
+        self.n_records = int(n_records)
+        self.n_coefficients = (int(record_size) - 2) // 3
+        # (n_records, record_size): MID, RADIUS, then X, Y and Z coefficients
+        self.records = data[:self.n_records * int(record_size)].reshape(self.n_records, int(record_size))
+
+    def covers(self, et: np.ndarray) -> np.ndarray:
+        return (et >= self.start_et) & (et <= self.end_et)
+
+    def positions(self, et: np.ndarray) -> np.ndarray:
+        """Position in km for TDB seconds past J2000, shape (3, n)."""
+        index = np.clip(((et - self.init) // self.interval).astype(np.int64), 0, self.n_records - 1)
+        records = self.records[index]
+        s = (et - records[:, 0]) / records[:, 1]
+        coefficients = records[:, 2:].reshape(len(et), 3, self.n_coefficients)
+
+        # Chebyshev polynomials T_k(s) for every date, then one contraction for all three axes
+        polynomials = np.empty((len(et), self.n_coefficients))
+        polynomials[:, 0] = 1.0
+        if self.n_coefficients > 1:
+            polynomials[:, 1] = s
+        for k in range(2, self.n_coefficients):
+            polynomials[:, k] = 2.0 * s * polynomials[:, k - 1] - polynomials[:, k - 2]
+        return np.einsum('nak,nk->an', coefficients, polynomials)
+
+
+class SPKKernel:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._bytes = np.memmap(self.path, dtype=np.uint8, mode='r')
+        header = self._bytes[:RECORD_BYTES].tobytes()
+        if header[:7] not in (b'DAF/SPK', b'NAIF/DA'):
+            raise ValueError(f"{self.path} is not an SPK file")
+        fmt = header[88:96]
+        if fmt == b'BIG-IEEE':
+            self.byteorder = '>'
+        elif fmt == b'LTL-IEEE':
+            self.byteorder = '<'
+        else:
+            raise ValueError(f"Unsupported SPK byte order {fmt!r} in {self.path}")
+        n_doubles, n_ints, forward = np.frombuffer(header, dtype=self.byteorder + 'i4', count=18, offset=8)[[0, 1, 17]]
+        if (n_doubles, n_ints) != (2, 6):
+            raise ValueError(f"{self.path} has an unexpected summary format ({n_doubles}, {n_ints})")
+        self._doubles = self._bytes[:len(self._bytes) // 8 * 8].view(self.byteorder + 'f8')
+        self.segments: Dict[int, List[SPKSegment]] = {}
+        self._read_summaries(int(forward))
+
+    def _read_summaries(self, record: int):
+        """Walk the linked list of summary records; `record` is 1-based."""
+        summary_doubles = 2 + (6 + 1) // 2
+        while record:
+            offset = (record - 1) * RECORD_BYTES
+            block = self._bytes[offset:offset + RECORD_BYTES].tobytes()
+            next_record, _, n_summaries = np.frombuffer(block, dtype=self.byteorder + 'f8', count=3)
+            for n in range(int(n_summaries)):
+                start = 24 + n * summary_doubles * 8
+                start_et, end_et = np.frombuffer(block, dtype=self.byteorder + 'f8', count=2, offset=start)
+                target, center, frame, data_type, first, last = np.frombuffer(
+                    block, dtype=self.byteorder + 'i4', count=6, offset=start + 16
+                )
+                if data_type != 2:
+                    logger.debug("Skipping SPK segment %d->%d of type %d", center, target, data_type)
+                    continue
+                segment = SPKSegment(
+                    int(target), int(center), int(frame), float(start_et), float(end_et),
+                    self._doubles[first - 1:last]
+                )
+                self.segments.setdefault(segment.target, []).append(segment)
+            record = int(next_record)
+
+    def _relative(self, target: int, et: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Position of `target` relative to its segment centre; later segments take precedence."""
+        segments = self.segments.get(target)
+        if not segments:
+            raise KeyError(f"NAIF ID {target} is not in {self.path.name}")
+        result = np.full((3, len(et)), np.nan)
+        covered = np.zeros(len(et), dtype=bool)
+        for segment in reversed(segments):
+            mask = segment.covers(et) & ~covered
+            if mask.any():
+                result[:, mask] = segment.positions(et[mask])
+                covered |= mask
+            if covered.all():
+                break
+        if not covered.all():
+            raise ValueError(f"Dates outside the range of {self.path.name} for NAIF ID {target}")
+        return result, segments[0].center
+
+    def barycentric(self, target: int, et: np.ndarray) -> np.ndarray:
+        """Position of `target` relative to the solar system barycentre in km, shape (3, n)."""
+        et = np.atleast_1d(np.asarray(et, dtype=np.float64))
+        position = np.zeros((3, len(et)))
+        while target != 0:
+            relative, target = self._relative(target, et)
+            position += relative
+        return position
+
+    def body_barycentric(self, body: str, et: np.ndarray) -> np.ndarray:
+        """Barycentric position in km of a named body (see `BODY_IDS`)."""
+        try:
+            target = BODY_IDS[body.lower()]
+        except KeyError:
+            raise KeyError(f"Unknown body {body!r}") from None
+        return self.barycentric(target, et)
+
+    def heliocentric(self, body: str, et: np.ndarray) -> np.ndarray:
+        """Heliocentric position of a named body in km, shape (3, n)."""
+        return self.body_barycentric(body, et) - self.body_barycentric('sun', et)
+
+
+def julian_date_to_et(jd1, jd2=0.0) -> np.ndarray:
+    """TDB seconds past J2000 from a (two-part) TDB Julian date."""
+    return ((np.asarray(jd1, dtype=np.float64) - J2000_JD) + jd2) * SECONDS_PER_DAY
+
+
+_kernels: Dict[str, SPKKernel] = {}
+_kernels_lock = threading.Lock()
+
+
+def open_kernel(path) -> SPKKernel:
+    """
+    The process-wide reader for a kernel file, mapped on first use.
+    Every caller in the process gets the same instance.
+    """
+    key = os.path.realpath(path)
+    with _kernels_lock:
+        kernel = _kernels.get(key)
+        if kernel is None:
+            logger.info("Mapping SPK kernel %s", key)
+            kernel = _kernels[key] = SPKKernel(key)
+        return kernel
@@ -0,0 +1,111 @@
+"""
+Chunked output sinks with checkpoints for long ephemeris runs.
+
+A sink appends DataFrame chunks to a CSV file or to a directory of Parquet
+part files as they are produced, and records a checkpoint after each chunk so
+an interrupted run can resume from the last chunk written.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SINK_FORMATS = ("csv", "parquet")
+
+
+class ChunkSink:
+    def __init__(self, path, fmt: str = "csv", resume: bool = True, params: Optional[dict] = None):
+        """
+        Args:
+            path: Output CSV file, or output directory for Parquet part files.
+            fmt (str): "csv" or "parquet".
+            resume (bool): Continue from an existing checkpoint instead of starting over.
+            params (dict): Run parameters; a checkpoint is only resumed if they match.
+        """
+        if fmt not in SINK_FORMATS:
+            raise ValueError(f"Invalid format: {fmt}. Use one of {', '.join(SINK_FORMATS)}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.params = params or {}
+        self.checkpoint_path = self.path.with_name(self.path.name + ".checkpoint.json")
+        self.chunks_written = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.complete = False
+
+        if resume and self.checkpoint_path.exists():
+            self._load_checkpoint()
+        else:
+            self._reset()
+
+    def _load_checkpoint(self):
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        if state.get("params") != self.params or state.get("format") != self.fmt:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was written for a different run; "
+                "use resume=False to start over"
+            )
+        self.chunks_written = state["chunks_written"]
+        self.rows_written = state["rows_written"]
+        self.bytes_written = state.get("bytes_written", 0)
+        self.complete = state.get("complete", False)
+        if self.fmt == "csv" and self.path.exists():
+            # Drop anything written after the last checkpoint (e.g. a partial chunk)
+            with open(self.path, "r+b") as f:
+                f.truncate(self.bytes_written)
+        logger.info("Resuming %s after %d chunks", self.path, self.chunks_written)
+
+    def _reset(self):
+        if self.fmt == "csv":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                self.path.unlink()
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for part in self.path.glob("part-*.parquet"):
+                part.unlink()
+        self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        state = {
+            "format": self.fmt,
+            "params": self.params,
+            "chunks_written": self.chunks_written,
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "complete": self.complete,
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.checkpoint_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def write(self, df):
+        """Append one chunk and record the checkpoint."""
+        if not df.empty:
+            if self.fmt == "csv":
+                with open(self.path, "a", newline="") as f:
+                    df.to_csv(f, header=self.rows_written == 0)
+                self.bytes_written = self.path.stat().st_size
+            else:
+                try:
+                    df.to_parquet(self.path / f"part-{self.chunks_written:06d}.parquet")
+                except ImportError as e:
+                    raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+            self.rows_written += len(df)
+        self.chunks_written += 1
+        self._save_checkpoint()
+
+    def close(self, keep_checkpoint: bool = True):
+        """Mark the run as complete; without `keep_checkpoint` the checkpoint file is removed instead."""
+        self.complete = True
+        if keep_checkpoint:
+            self._save_checkpoint()
+        else:
+            self.checkpoint_path.unlink(missing_ok=True)
@@ -0,0 +1,128 @@
+"""
+Compact pairwise synodic-angle tables.
+
+Synodic angles for every unique pair of bodies are computed as one broadcast
+(n_dates x n_pairs) NumPy array; labelled DataFrame columns are only built
+when a caller asks for them.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from instrument import profiler
+
+# Dates per block in `synodic_angles`, which bounds its float64 temporaries
+ANGLE_CHUNK = 1 << 14
+
+
+def pair_indices(n_bodies: int):
+    """Index arrays (first, second) of every unique pair, in `itertools.combinations` order."""
+    return np.triu_indices(n_bodies, k=1)
+
+
+def synodic_angles(longitudes: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """
+    Synodic angles (0-180 degrees) for every unique pair of longitude columns.
+
+    Args:
+        longitudes (ndarray): Array of shape (n_dates, n_bodies) in degrees.
+        dtype: Output dtype, e.g. np.float32 to halve memory.
+
+    Returns:
+        ndarray: Array of shape (n_dates, n_pairs).
+    """
+    first, second = pair_indices(longitudes.shape[1])
+    angles = np.empty((len(longitudes), len(first)), dtype=dtype)
+    # Differences are taken in float64 a block of dates at a time and written straight into the output
+    for start in range(0, len(longitudes), ANGLE_CHUNK):
+        block = longitudes[start:start + ANGLE_CHUNK]
+        diff = block[:, second]
+        diff -= block[:, first]
+        diff %= 360
+        np.minimum(diff, 360 - diff, out=diff)
+        angles[start:start + len(block)] = diff
+    return angles
+
+
+class SynodicTable:
+    """
+    Longitudes and pairwise synodic angles for a set of bodies on a date grid.
+
+    `longitudes` has shape (n_dates, n_bodies) and `angles` (n_dates, n_pairs).
+    `index` is a DatetimeIndex or an array of Julian dates, and `valid` marks the
+    dates where every longitude is known. The labelled DataFrame is built lazily
+    by `to_frame`; `to_arrays` and `to_records` return plain NumPy arrays.
+    """
+
+    def __init__(self, index, bodies: List[str], longitudes: np.ndarray, dtype=np.float64):
+        self.index = index
+        self.bodies = list(bodies)
+        self.longitudes = longitudes.astype(dtype, copy=False)
+        with profiler.stage("synodic_angles"):
+            self.angles = synodic_angles(longitudes, dtype=dtype)
+        self.valid = ~np.isnan(self.longitudes).any(axis=1)
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_longitudes(cls, index, bodies: List[str], longitudes: np.ndarray, dtype=np.float64,
+                        drop_invalid: bool = True):
+        """Build a table, dropping dates where any body's longitude is missing unless `drop_invalid` is False."""
+        if drop_invalid:
+            valid = ~np.isnan(longitudes).any(axis=1)
+            if not valid.all():
+                index, longitudes = index[valid], longitudes[valid]
+        return cls(index, bodies, longitudes, dtype=dtype)
+
+    @property
+    def pairs(self):
+        """(body_1, body_2) name pairs matching the columns of `angles`."""
+        first, second = pair_indices(len(self.bodies))
+        return [(self.bodies[i], self.bodies[j]) for i, j in zip(first, second)]
+
+    @property
+    def columns(self) -> List[str]:
+        return self.bodies + [f"{body2}-{body1}_synodic" for body1, body2 in self.pairs]
+
+    @property
+    def empty(self) -> bool:
+        return len(self.index) == 0
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def angle(self, body1: str, body2: str) -> np.ndarray:
+        """Synodic angle series for one pair, without building the DataFrame."""
+        i, j = sorted((self.bodies.index(body1), self.bodies.index(body2)))
+        return self.angles[:, self.pairs.index((self.bodies[i], self.bodies[j]))]
+
+    def to_arrays(self, index_name: str = "jd") -> Dict[str, np.ndarray]:
+        """
+        Columns as a dict of arrays: `index_name` (the index), "valid", then one
+        entry per body and per pair named as in `columns`. Values are views, not copies.
+        """
+        arrays = {index_name: np.asarray(self.index), "valid": self.valid}
+        arrays.update(zip(self.bodies, self.longitudes.T))
+        arrays.update(zip(self.columns[len(self.bodies):], self.angles.T))
+        return arrays
+
+    def to_records(self, index_name: str = "jd") -> np.ndarray:
+        """One structured array with the fields of `to_arrays`."""
+        arrays = self.to_arrays(index_name)
+        records = np.empty(len(self), dtype=[(name, values.dtype) for name, values in arrays.items()])
+        for name, values in arrays.items():
+            records[name] = values
+        return records
+
+    def to_frame(self) -> pd.DataFrame:
+        """Labelled DataFrame with one column per body and per pair (cached)."""
+        if self._frame is None:
+            with profiler.stage("dataframe_assembly"):
+                if self.empty:
+                    self._frame = pd.DataFrame()
+                else:
+                    self._frame = pd.DataFrame(
+                        np.hstack([self.longitudes, self.angles]), index=self.index, columns=self.columns
+                    )
+        return self._frame
@@ -0,0 +1,327 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.astro import Ephemeris
+from src.chebyshev import ChebyshevStore, MAX_ERROR_ARCSEC
+from src.streaming import ChunkSink
+
+
+def test_chebyshev_longitudes_within_error_bound(tmp_path):
+    eph = Ephemeris()
+    # The range spans the 2016-12-31 leap second, which `check` always samples around
+    store = ChebyshevStore(eph, start='2016-01-01', end='2018-01-01', directory=tmp_path)
+    for body in ['mercury', 'neptune']:
+        assert store.check(body, samples=500) <= MAX_ERROR_ARCSEC
+
+
+def test_chebyshev_falls_back_outside_range(tmp_path):
+    eph = Ephemeris()
+    store = ChebyshevStore(eph, start='2000-01-01', end='2000-06-01', directory=tmp_path)
+    dates = pd.to_datetime(['2000-03-01', '2001-03-01'])
+    reference = eph.get_heliocentric_longitudes_vectorized(dates, 'mars')
+    assert np.allclose(store.longitudes(dates, 'mars'), reference, atol=1e-5)
+
+
+def test_batch_longitudes_match_per_body_reference():
+    eph = Ephemeris()
+    dates = pd.date_range('2000-01-01', '2001-01-01', freq='30D')
+    bodies = ['mercury', 'earth', 'neptune']
+    batch = eph.get_heliocentric_longitudes_batch(dates, bodies)
+    assert batch.shape == (len(dates), len(bodies))
+    for j, body in enumerate(bodies):
+        assert np.allclose(batch[:, j], eph.get_heliocentric_longitudes_vectorized(dates, body))
+
+
+def test_longitude_store_only_computes_missing_samples(tmp_path):
+    from src.longitude_store import LongitudeStore
+    store = LongitudeStore(tmp_path)
+    requested = []
+
+    def compute(dates, bodies):
+        requested.append(len(dates))
+        return np.tile(np.arange(len(dates), dtype=float)[:, None], (1, len(bodies)))
+
+    first = pd.date_range('2000-01-01', periods=20, freq='7D')
+    store.longitudes(first, ['mars', 'venus'], 7, compute)
+    shifted = pd.date_range('2000-02-12', periods=30, freq='7D')
+    values = store.longitudes(shifted, ['mars', 'venus'], 7, compute)
+    assert requested == [20, 16]
+    assert not np.isnan(values['mars']).any()
+    # A fully cached range within one segment is served from the memory map
+    cached = store.longitudes(first[:10], ['mars'], 7, compute)
+    assert isinstance(cached['mars'], np.memmap) and requested == [20, 16]
+    # Failed samples are remembered rather than stored, and computed again after a reset
+    assert np.isnan(store.longitudes(first, ['pluto'], 7, lambda d, b: np.full((len(d), len(b)), np.nan))['pluto']).all()
+    assert np.isnan(store.longitudes(first, ['pluto'], 7, compute)['pluto']).all() and requested == [20, 16]
+    store.reset_failures()
+    assert not np.isnan(store.longitudes(first, ['pluto'], 7, compute)['pluto']).any()
+
+
+def test_single_date_memo_counts_hits_and_evictions():
+    eph = Ephemeris(memo_size=2)
+    first = eph.get_heliocentric_longitude('2000-01-01', 'mars')
+    assert eph.get_heliocentric_longitude('2000-01-01', 'mars') == first
+    eph.get_heliocentric_longitude('2000-01-02', 'mars')
+    eph.get_heliocentric_longitude('2000-01-03', 'mars')
+    stats = eph.memo_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 3, 1)
+    assert stats['size'] == 2
+
+
+def test_synodic_events_are_refined_to_tolerance():
+    eph = Ephemeris()
+    events = eph.find_synodic_events('2000-01-01', '2001-01-01', pairs=[('earth', 'mercury')],
+                                     angles=[0, 180], tolerance=30.0)
+    # Mercury's synodic period relative to Earth is ~116 days
+    assert (events['event'] == 'conjunction').sum() == 3
+    lon = eph.get_heliocentric_longitudes_at_jd(events['jd'].to_numpy(), ['earth', 'mercury'])
+    ahead = eph.get_heliocentric_longitudes_at_jd(events['jd'].to_numpy() + 0.01, ['earth', 'mercury'])
+    residual = (lon[:, 1] - lon[:, 0] - events['elongation'].to_numpy() + 180) % 360 - 180
+    rate = (((ahead[:, 1] - ahead[:, 0]) - (lon[:, 1] - lon[:, 0]) + 180) % 360 - 180) / 0.01
+    assert np.all(np.abs(residual / rate) * 86400 < 30.0)
+
+
+def test_parallel_longitudes_match_serial():
+    eph = Ephemeris()
+    bodies = ['venus', 'earth', 'mars']
+    serial = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2001-01-01', bodies, step=3)
+    parallel = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2001-01-01', bodies, step=3,
+                                                           workers=2, chunk_size=20)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_streamed_csv_matches_full_run_and_resumes(tmp_path):
+    eph = Ephemeris()
+    bodies = ['venus', 'earth', 'mars']
+    full = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-12-31', bodies, step=5)
+    path = tmp_path / 'run.csv'
+    chunks = eph.iter_longitudes_and_synodic_angles('2000-01-01', '2000-12-31', bodies, step=5, chunk_rows=16)
+    params = {'start': '2000-01-01', 'end': '2000-12-31', 'bodies': bodies, 'step': 5, 'chunk_rows': 16}
+    sink = ChunkSink(path, params=params)
+    # Simulate an interruption after two chunks
+    sink.write(next(chunks))
+    sink.write(next(chunks))
+    resumed = eph.stream_longitudes_and_synodic_angles('2000-01-01', '2000-12-31', bodies, path,
+                                                       step=5, chunk_rows=16)
+    assert resumed.complete and resumed.rows_written == len(full)
+    assert path.read_text() == full.to_csv()
+
+    # A different run into the same file starts over and leaves no checkpoint behind
+    eph.stream_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'], path, step=5,
+                                             resume=False, keep_checkpoint=False)
+    assert path.read_text() == eph.calculate_longitudes_and_synodic_angles(
+        '2000-01-01', '2000-03-01', ['mars', 'venus'], step=5).to_csv()
+    assert not resumed.checkpoint_path.exists()
+
+    # A fractional step keeps every grid point at the chunk boundaries
+    fractional = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'], step=0.7)
+    eph.stream_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'], path, step=0.7,
+                                             chunk_rows=10, resume=False, keep_checkpoint=False)
+    assert path.read_text() == fractional.to_csv()
+
+
+def test_synodic_table_matches_per_pair_columns():
+    eph = Ephemeris()
+    bodies = ['mercury', 'venus', 'earth', 'mars']
+    table = eph.calculate_synodic_table('2000-01-01', '2001-01-01', bodies, step=7)
+    df = table.to_frame()
+    for body1, body2 in table.pairs:
+        angle_diff = np.abs((df[body2] - df[body1]) % 360)
+        expected = np.minimum(angle_diff, 360 - angle_diff)
+        assert np.array_equal(df[f"{body2}-{body1}_synodic"].to_numpy(), expected.to_numpy())
+    compact = eph.calculate_synodic_table('2000-01-01', '2001-01-01', bodies, step=7, dtype=np.float32)
+    assert compact.angles.dtype == np.float32 and compact.angles.shape == (len(df), 6)
+    assert np.allclose(compact.angle('venus', 'mercury'), df['venus-mercury_synodic'], atol=1e-4)
+
+
+def test_profiler_records_stages_only_when_enabled(tmp_path):
+    from src import astro
+    from src.longitude_store import LongitudeStore
+    profiler = astro.profiler
+    eph = Ephemeris()
+    eph.longitude_store = LongitudeStore(tmp_path)
+    profiler.reset()
+    eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'], step=7)
+    assert profiler.summary() == {"stages": {}, "counters": {}}
+
+    profiler.enable()
+    try:
+        eph.calculate_synodic_period('2000-01-01', '2000-03-01', 'mars', 'venus', step=7)
+        eph.calculate_synodic_period('2000-01-01', '2000-03-01', 'mars', 'venus', step=7)
+    finally:
+        profiler.disable()
+    summary = profiler.summary()
+    profiler.reset()
+    assert {"time_conversion", "ephemeris_eval_builtin", "dataframe_assembly"} <= set(summary["stages"])
+    assert summary["stages"]["dataframe_assembly"]["calls"] == 2
+    # 9 grid dates per run: computed on the first run, served from the store on the second
+    assert summary["counters"]["longitude_store_misses"] == 9
+    assert summary["counters"]["longitude_store_hits"] == 9
+    assert "Profile:" in profiler.report()
+
+
+def _write_spk(path, segments, start_et, interval, n_records):
+    """Minimal little-endian DAF/SPK file with one type 2 segment per (target, center, coefficients)."""
+    import struct
+    data, summaries = [], []
+    address = 3 * 128 + 1
+    for target, center, coefficients in segments:
+        n_coefficients = coefficients.shape[-1]
+        for i in range(n_records):
+            data += [start_et + (i + 0.5) * interval, interval / 2, *coefficients[i].ravel()]
+        data += [start_et, interval, 2 + 3 * n_coefficients, n_records]
+        end = 3 * 128 + len(data)
+        summaries.append(struct.pack('<2d6i', start_et, start_et + n_records * interval,
+                                     target, center, 1, 2, address, end))
+        address = end + 1
+    header = struct.pack('<8s2i60s3i8s', b'DAF/SPK ', 2, 6, b'synthetic'.ljust(60), 2, 2, address, b'LTL-IEEE')
+    summary = struct.pack('<3d', 0, 0, len(summaries)) + b''.join(summaries)
+    with open(path, 'wb') as f:
+        for record in (header, summary, b''):
+            f.write(record.ljust(1024, b'\0'))
+        f.write(struct.pack(f'<{len(data)}d', *data))
+
+
+def test_spk_reader_evaluates_type2_segments(tmp_path):
+    from numpy.polynomial import chebyshev
+    from astropy.time import Time
+    from src.spk import open_kernel
+    rng = np.random.default_rng(0)
+    interval, n_records = 4 * 86400.0, 5
+    sun = rng.normal(scale=1e5, size=(n_records, 3, 8))
+    mars = rng.normal(scale=2e8, size=(n_records, 3, 8))
+    path = tmp_path / 'de440.bsp'
+    _write_spk(path, [(10, 0, sun), (4, 0, mars)], 0.0, interval, n_records)
+
+    kernel = open_kernel(path)
+    assert open_kernel(path) is kernel
+    et = np.linspace(1000.0, n_records * interval - 1000.0, 50)
+    record = (et // interval).astype(int)
+    s = (et - (record + 0.5) * interval) / (interval / 2)
+    expected = np.array([[chebyshev.chebval(s[n], mars[record[n], axis] - sun[record[n], axis])
+                          for n in range(len(et))] for axis in range(3)])
+    np.testing.assert_allclose(kernel.heliocentric('mars', et), expected, rtol=1e-12)
+
+    # The de440 source reads the local kernel instead of going through astropy
+    eph = Ephemeris()
+    eph.ephemeris_path = str(path)
+    jd = 2451545.0 + np.array([1.0, 5.5, 12.25])
+    xyz = eph.get_heliocentric_positions(jd, 'mars', source='de440')
+    tdb = Time(jd, format='jd', scale='utc').tdb
+    et = (tdb.jd1 - 2451545.0 + tdb.jd2) * 86400.0
+    np.testing.assert_allclose(xyz, kernel.heliocentric('mars', et) / 149597870.7, rtol=1e-12)
+
+
+def test_ecliptic_longitudes_match_astropy_frames():
+    import warnings
+    from astropy.coordinates import (
+        HeliocentricMeanEcliptic, HeliocentricTrueEcliptic, ICRS, SkyCoord, get_body_barycentric
+    )
+    from astropy.time import Time
+    eph = Ephemeris()
+    dates = pd.date_range('1950-01-01', '2050-01-01', periods=40)
+    times = Time(dates)
+    bodies = ['mars', 'jupiter']
+    for frame, astropy_frame in [('ecliptic_j2000', HeliocentricMeanEcliptic(obstime=times)),
+                                 ('ecliptic_date', HeliocentricTrueEcliptic(obstime=times, equinox=times))]:
+        result = eph.get_heliocentric_longitudes_batch(dates, bodies, frame=frame)
+        for j, body in enumerate(bodies):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                pos = get_body_barycentric(body, times, ephemeris='builtin')
+                expected = SkyCoord(pos, frame=ICRS(), obstime=times).transform_to(astropy_frame).lon.deg
+            error = (result[:, j] - expected + 180) % 360 - 180
+            assert np.abs(error).max() * 3600 < 1e-3
+    # Ecliptic and equatorial longitudes differ by up to the obliquity's effect
+    icrs = eph.get_heliocentric_longitudes_batch(dates, bodies)
+    assert np.abs(icrs - eph.get_heliocentric_longitudes_batch(dates, bodies, frame='ecliptic_date')).max() > 1
+
+
+def test_adaptive_sampling_stays_within_tolerance(caplog):
+    eph = Ephemeris()
+    bodies = ['mars', 'jupiter', 'saturn', 'neptune']
+    exact = eph.calculate_synodic_table('2000-01-01', '2004-01-01', bodies, step=1)
+    samples = eph.sample_adaptive('2000-01-01', '2004-01-01', bodies, tolerance=0.05)
+    adaptive = samples.resample(exact.index)
+    assert sum(samples.evaluations.values()) * 10 < len(exact) * len(bodies)
+    assert samples.evaluations['neptune'] < samples.evaluations['mars']
+    assert np.abs(adaptive.angles - exact.angles).max() < 0.05
+    assert np.abs((adaptive.longitudes - exact.longitudes + 180) % 360 - 180).max() < 0.025
+    # A tolerance that cannot be met at the minimum step is reported rather than silently missed
+    eph.sample_adaptive('2000-01-01', '2000-01-10', ['mars'], tolerance=1e-9, min_step=0.5)
+    assert "exceed the tolerance" in caplog.text
+
+
+def test_array_output_uses_julian_grid_and_keeps_invalid_rows():
+    eph = Ephemeris()
+    arrays = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'], 7, output='arrays')
+    frame = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'], 7)
+    assert arrays['mars'].dtype == np.float32 and arrays['valid'].all()
+    np.testing.assert_allclose(arrays['jd'], frame.index.to_julian_date())
+    np.testing.assert_allclose(arrays['venus-mars_synodic'], frame['venus-mars_synodic'], atol=1e-4)
+
+    records = eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-01-02', ['mars', 'nowhere'], 1 / 24,
+                                                          output='records')
+    assert len(records) == 25 and records['jd'][-1] == 2451545.5
+    assert not records['valid'].any() and np.isfinite(records['mars']).all()
+
+
+def test_position_table_interpolates_and_falls_back_outside_range(tmp_path):
+    from src import position_table
+    eph = Ephemeris()
+    table = position_table.build(eph, tmp_path / 'positions.npy', start='2000-01-01', end='2000-03-01')
+    assert isinstance(table.values, np.memmap) and table.end_jd == 2451544.5 + 60
+    jd = np.array([2451545.25, 2451590.9, 2451544.5, 2451700.0])
+    reference = eph.get_heliocentric_longitudes_at_jd(jd[:3], table.bodies)
+    values = table.longitudes(jd)
+    assert np.abs((values[:3] - reference + 180) % 360 - 180).max() < 1e-3
+    assert np.isnan(values[3]).all()
+
+    bodies = ['mars', 'venus']
+    for date in ['2000-02-10', '2001-01-01']:
+        expected = eph.calculate_longitudes_and_synodic_angles(date, date, bodies, step=1)
+        pd.testing.assert_frame_equal(position_table.positions(date, bodies, table=table), expected,
+                                      check_freq=False, atol=1e-3)
+
+
+def test_source_selection_uses_validation_table_and_skips_known_failures(tmp_path, monkeypatch):
+    import json
+    from src.sources import SourceSelector
+    table = tmp_path / 'accuracy.json'
+    entry = lambda error: [{'start': '1900-01-01', 'end': '2050-01-01', 'max_error_arcsec': error}]
+    table.write_text(json.dumps({'tiers': {'chebyshev': {'mars': entry(17.1)}, 'builtin': {'mars': entry(17.0)},
+                                           'de440': {'mars': entry(0.0)}}}))
+    selector = SourceSelector(table)
+    jd = [2451545.0, 2460000.0]
+    tiers = ('chebyshev', 'builtin', 'de440')
+    assert selector.candidates('mars', jd, 20, tiers) == ['chebyshev', 'builtin', 'de440']
+    assert selector.candidates('mars', jd, 17, tiers) == ['builtin', 'de440']
+    assert selector.candidates('mars', jd, None) == ['builtin', 'de440']
+    with pytest.raises(ValueError):
+        selector.candidates('mars', [2400000.5], 20, tiers)
+
+    eph = Ephemeris()
+    calls = []
+    barycentric = eph._barycentric
+
+    def counting_barycentric(body, times, source):
+        calls.append((body, source))
+        return barycentric(body, times, source)
+
+    monkeypatch.setattr(eph, '_barycentric', counting_barycentric)
+    dates = pd.date_range('2000-01-01', '2000-03-01', freq='7D')
+    for _ in range(2):
+        values = eph.get_heliocentric_longitudes_batch(dates, ['mars', 'pluto'])
+        assert np.isfinite(values[:, 0]).all() and np.isnan(values[:, 1]).all()
+    assert calls.count(('pluto', 'builtin')) == 1
+    assert eph.calculate_longitudes_and_synodic_angles('2000-01-01', '2000-03-01', ['mars', 'venus'],
+                                                       accuracy=20).shape == (9, 3)
+
+
+def test_committed_accuracy_table_offers_de440_for_sub_arcsecond_requests():
+    from src.sources import SourceSelector, load_accuracy_table
+    first, last, _ = load_accuracy_table()['de440']['mars'][0]
+    assert first < 2300000.0 < 2451545.0 < 2680000.0 < last
+    selector = SourceSelector()
+    assert selector.validated('mars', [2451545.0], 1.0) == ['de440']
+    assert selector.candidates('mars', [2400000.5, 2451545.0], 0.5) == ['de440']
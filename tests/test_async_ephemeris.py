@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+from src.astro import Ephemeris
+from src.async_ephemeris import AsyncEphemeris
+from src.longitude_store import LongitudeStore
+
+
+class _SlowEphemeris:
+    use_chebyshev = False
+
+    def __init__(self):
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def calculate_longitudes_and_synodic_angles(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+        return kwargs["start"]
+
+
+def test_identical_requests_share_one_computation_and_concurrency_is_bounded():
+    eph = _SlowEphemeris()
+
+    async def run():
+        async with AsyncEphemeris(eph, max_concurrency=2, workers=4) as aeph:
+            # Equal values of different types (7 and 7.0, a string and a Timestamp) are the same request
+            same = [aeph.calculate_longitudes_and_synodic_angles(start, "2001-01-01", ["mars", "venus"], step)
+                    for start, step in [("2000-01-01", 7), (pd.Timestamp("2000-01-01"), 7.0), ("2000-01-01", 7.0)]]
+            distinct = [aeph.calculate_longitudes_and_synodic_angles(f"20{n:02d}-01-01", "2030-01-01", ["mars"])
+                        for n in range(1, 6)]
+            results = await asyncio.gather(*same, *distinct)
+            return results, aeph.stats()
+
+    results, stats = asyncio.run(run())
+    assert results[:3] == ["2000-01-01"] * 3
+    assert len(eph.calls) == 6 and stats["coalesced"] == 2 and stats["in_flight"] == 0
+    assert eph.peak == 2
+
+
+def test_process_executor_matches_direct_computation(tmp_path):
+    eph = Ephemeris(cache_dir=tmp_path)
+
+    async def run():
+        async with AsyncEphemeris(eph, processes=True, max_concurrency=1) as aeph:
+            return await aeph.calculate_synodic_period("2000-01-01", "2000-03-01", "mars", "venus")
+
+    remote = asyncio.run(run())
+    eph.longitude_store = LongitudeStore(tmp_path / "direct")
+    expected = eph.calculate_synodic_period("2000-01-01", "2000-03-01", "mars", "venus")
+    pd.testing.assert_frame_equal(remote, expected, check_freq=False)
@@ -0,0 +1,68 @@
+import gc
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from src.cache import CacheManager, atomic_write, file_lock, parse_size
+from src.longitude_store import LongitudeStore
+
+
+def _write(manager, name, size):
+    path = manager.root / name
+    atomic_write(path, lambda f: f.write(b"x" * size))
+    manager.record(path)
+    return path
+
+
+def test_cache_evicts_least_recently_used_files_to_budget(tmp_path):
+    manager = CacheManager(tmp_path, max_bytes=2500)
+    first = _write(manager, "a/first.npy", 1000)
+    second = _write(manager, "b/second.npy", 1000)
+    time.sleep(0.01)
+    manager.touch(first)
+    third = _write(manager, "third.npy", 1000)
+    assert first.exists() and third.exists() and not second.exists()
+    assert manager.stats()["bytes"] == 2000
+    assert manager.prune(0) == 2000 and manager.stats()["files"] == 0
+    assert parse_size("1.5K") == 1536 and parse_size("2G") == 2 << 30
+
+
+def test_eviction_removes_locks_and_skips_pinned_and_locked_files(tmp_path):
+    manager = CacheManager(tmp_path, max_bytes=10000)
+    table = tmp_path / "positions" / "longitudes_icrs.npy"
+    for path in (table, table.with_suffix(".json")):
+        atomic_write(path, lambda f: f.write(b"x" * 1000))
+    manager.record(table, table.with_suffix(".json"), pinned=True)
+    segment = _write(manager, "longitudes/0.npy", 1000)
+    busy = _write(manager, "longitudes/1.npy", 1000)
+    with file_lock(segment):
+        pass
+    with file_lock(busy):
+        assert manager.prune(0) == 1000
+    assert table.exists() and table.with_suffix(".json").exists() and busy.exists()
+    assert not segment.exists() and not (tmp_path / "longitudes" / "0.npy.lock").exists()
+    assert manager.prune(0) == 1000 and not (tmp_path / "longitudes" / "1.npy.lock").exists()
+    assert manager.stats()["files"] == 2
+    # The memo's shelve files are never evicted, and discarded managers are not kept alive
+    atomic_write(tmp_path / "memo" / "longitudes.db", lambda f: f.write(b"x" * 1000))
+    assert manager.prune(0) == 0 and manager.stats()["files"] == 3
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
+
+
+def _store_samples(directory, offset):
+    store = LongitudeStore(directory, cache=CacheManager(directory))
+    dates = np.datetime64("2000-01-01") + np.arange(offset, 400, 4).astype("timedelta64[D]")
+    for k in range(len(dates)):
+        store.longitudes(dates[k:k + 1], ["mars"], 1, lambda d, b: np.full((len(d), len(b)), float(offset)))
+
+
+def test_concurrent_processes_do_not_lose_segment_updates(tmp_path):
+    with ProcessPoolExecutor(4) as pool:
+        list(pool.map(_store_samples, [tmp_path] * 4, range(4)))
+    dates = np.datetime64("2000-01-01") + np.arange(400).astype("timedelta64[D]")
+    values = LongitudeStore(tmp_path).longitudes(dates, ["mars"], 1, lambda d, b: np.full((len(d), len(b)), -1.0))
+    np.testing.assert_array_equal(values["mars"], np.arange(400) % 4)
@@ -0,0 +1,16 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_cli_import_defers_heavy_modules():
+    code = (
+        "import json, sys, cli; "
+        "print(json.dumps([m for m in ('astropy', 'pandas', 'numpy', 'astro') if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    assert json.loads(out) == []
@@ -0,0 +1,24 @@
+from datetime import datetime
+from src.csv_export import Csv
+from src.calculations import Calculations
+from src.scales import scaling_configurations
+
+
+def test_cycle_table_covers_every_ratio_set_and_matches_scalar(tmp_path):
+    origins = [datetime(2020, 1, 1), datetime(2000, 1, 31)]
+    ends = [datetime(2022, 3, 15), datetime(2001, 1, 1)]
+    table = Csv.build_cycle_table(origins, ends, "months")
+    n_ratios = sum(len(r) for sets in scaling_configurations.values() for r in sets.values())
+    assert len(table) == len(origins) * n_ratios
+
+    row = table[(table["ratio_set"] == "Golden Expansion") & (table["origin"] == origins[1])].iloc[-1]
+    # Extension ratios are chained, as in the interactive menu
+    expected = 11 * 1.618 * 2 * 2.618 * 4.236
+    assert abs(row["duration"] - expected) < 1e-9
+    assert row["cycle_date"] == origins[1] + Calculations.calculate_delta("months", expected, "+")
+
+    path = tmp_path / "cycles.csv"
+    Csv.export_table(table, path)
+    lines = path.read_text().splitlines()
+    assert lines[0] == "origin,end,scale,time_diff,scaling_mode,ratio_set,ratio,generation,duration,cycle_date"
+    assert len(lines) == len(table) + 1
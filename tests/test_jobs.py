@@ -0,0 +1,32 @@
+import csv
+import json
+
+import pytest
+from src.jobs import load_jobs, run_jobs
+
+
+def test_batch_jobs_write_one_result_per_job(tmp_path):
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(json.dumps([
+        {"id": "diff", "type": "time_difference", "start": "2020-01-01", "end": "2022-03-15", "scale": "years"},
+        {"id": "offset", "type": "date_offset", "date": "2020-01-31", "scale": "months", "duration": 1},
+        {"id": "angles", "type": "synodic", "start": "2000-01-01", "end": "2000-03-01",
+         "bodies": "venus, mars", "step": 7},
+        {"id": "bad", "type": "synodic", "start": "2000-01-01", "end": "2000-03-01", "bodies": "venus"},
+    ]))
+    summary = run_jobs(job_file, tmp_path / "out", workers=2)
+    assert [job["status"] for job in summary] == ["ok", "ok", "ok", "error"]
+    with open(tmp_path / "out" / "diff.csv") as f:
+        assert next(csv.DictReader(f)) == {"start": "2020-01-01T00:00:00", "end": "2022-03-15T00:00:00",
+                                           "years": "2", "months": "2", "days": "14"}
+    with open(tmp_path / "out" / "offset.csv") as f:
+        assert next(csv.DictReader(f))["date"] == "2020-02-29 00:00"
+    assert (tmp_path / "out" / "angles.csv").read_text().splitlines()[0] == ",venus,mars,mars-venus_synodic"
+
+
+def test_job_ids_must_be_unique_plain_file_names(tmp_path):
+    job_file = tmp_path / "jobs.json"
+    for ids in (["a", "a"], ["../escape"], ["sub/name"], [".."]):
+        job_file.write_text(json.dumps([{"id": i, "type": "time_difference"} for i in ids]))
+        with pytest.raises(ValueError, match="id"):
+            load_jobs(job_file)
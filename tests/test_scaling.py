@@ -0,0 +1,28 @@
+import numpy as np
+from src.scaling import project, scale_values
+from src.scales import scaling_configurations
+
+
+def test_projection_matrix_covers_all_ratio_sets():
+    intervals = [10, 26, 100]
+    projection = project(intervals)
+    n_ratios = sum(len(r) for sets in scaling_configurations.values() for r in sets.values())
+    assert projection.shape == (3, n_ratios)
+    fifths = projection.select("internal_division", "Fifths")
+    assert np.allclose(projection.values[1, fifths], [26 * r for r in [0.2, 0.4, 0.6, 0.8]])
+
+
+def test_extension_generations_chain_from_previous_generation():
+    ratios = scaling_configurations["extension"]["Golden Expansion"]
+    projection = project([10], generations=3)
+    golden = projection.select("extension", "Golden Expansion")
+    values = projection.values[0, golden]
+    # The old menu loop: each value is the previous one times the next ratio
+    expected, value = [], 10.0
+    for _ in range(3):
+        for r in ratios:
+            value = value * r
+            expected.append(value)
+    assert np.allclose(values, expected)
+    assert list(projection.generation[golden]) == [1] * 4 + [2] * 4 + [3] * 4
+    assert np.allclose(scale_values(10, ratios, "extension"), expected[:4])
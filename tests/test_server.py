@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from src.astro import Ephemeris
+from src.longitude_store import LongitudeStore
+from src.server import EphemerisService, ServiceClient, make_server
+
+
+def test_identical_concurrent_queries_share_one_computation():
+    service = EphemerisService()
+    release = threading.Event()
+    calls = []
+
+    def compute(job):
+        calls.append(job)
+        release.wait(5)
+        return {"value": 42}
+
+    service._compute = compute
+    job = {"type": "time_difference", "start": "2020-01-01", "end": "2021-01-01"}
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(service.query, dict(job, id=n)) for n in range(4)]
+        while service.stats()["requests"] < 4:
+            time.sleep(0.01)
+        release.set()
+        assert [f.result() for f in futures] == [{"value": 42}] * 4
+    assert len(calls) == 1
+    assert service.stats()["coalesced"] == 3
+
+
+def test_client_queries_warm_server(tmp_path):
+    eph = Ephemeris()
+    eph.longitude_store = LongitudeStore(tmp_path)
+    server = make_server(port=0, ephemeris=eph)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = ServiceClient(*server.server_address[:2])
+        assert client.available()
+        diff = client.query({"type": "time_difference", "start": "2020-01-01", "end": "2022-03-15", "scale": "years"})
+        assert (diff["years"], diff["months"], diff["days"]) == (2, 2, 14)
+
+        job = {"type": "sidereal", "start": "2000-01-01", "end": "2000-06-01", "bodies": "mars,venus", "step": 7}
+        remote = client.query(job)
+        expected = eph.calculate_longitudes_and_synodic_angles("2000-01-01", "2000-06-01", ["mars", "venus"], 7)
+        pd.testing.assert_frame_equal(remote, expected, check_freq=False, check_names=False, rtol=1e-9)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not ServiceClient(*server.server_address[:2]).available()
+
+
+def test_sidereal_tolerance_is_passed_to_the_ephemeris(monkeypatch):
+    service = EphemerisService()
+    calls = []
+    monkeypatch.setattr(service.runner, "compute", lambda job: calls.append(job) or "adaptive")
+    job = {"type": "sidereal", "start": "2000-01-01", "end": "2000-06-01", "bodies": "mars,venus", "tolerance": 0.01}
+    assert service.query(job) == "adaptive" and calls == [job]
+
+
+def test_long_query_does_not_block_other_astro_queries(tmp_path, monkeypatch):
+    eph = Ephemeris()
+    eph.longitude_store = LongitudeStore(tmp_path)
+    service = EphemerisService(ephemeris=eph)
+    release = threading.Event()
+    monkeypatch.setattr(service.runner, "compute", lambda job: release.wait(10))
+    with ThreadPoolExecutor(2) as pool:
+        slow = pool.submit(service.query, {"type": "synodic", "start": "2000-01-01", "end": "2001-01-01",
+                                           "bodies": "mars,venus"})
+        fast = pool.submit(service.query, {"type": "sidereal", "start": "2000-01-01", "end": "2000-03-01",
+                                           "bodies": "mars,venus", "step": 7})
+        assert len(fast.result(timeout=30)) == 9 and not slow.done()
+        release.set()
+        assert slow.result() is True
@@ -22,4 +22,29 @@ def test_validate_key_valid():
 
 def test_validate_key_expired():
     key = "PLATINUM2025-2025-09-29"  # Expired
-    assert validate_key(key) == False
\ No newline at end of file
+    assert validate_key(key) == False
+
+def test_calculate_time_differences_matches_scalar():
+    import numpy as np
+    starts = [datetime(2020, 1, 31), datetime(2019, 3, 31, 18), datetime(2022, 3, 15), datetime(2000, 2, 29, 6)]
+    ends = [datetime(2020, 2, 29), datetime(2021, 2, 28, 6), datetime(2020, 1, 1), datetime(2004, 2, 28, 5)]
+    results = Calculations.calculate_time_differences(np.array(starts, dtype='datetime64[us]'),
+                                                      np.array(ends, dtype='datetime64[us]'))
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        for scale, columns in results.items():
+            expected = Calculations.calculate_time_difference(start, end, scale)
+            got = tuple(int(c[i]) for c in columns) if isinstance(columns, tuple) else int(columns[i])
+            assert got == expected
+
+
+def test_calculate_offsets_matches_scalar():
+    origins = [datetime(2020, 1, 31), datetime(2020, 2, 29), datetime(2021, 3, 31, 12), datetime(2019, 12, 31),
+               datetime(2000, 1, 1)]
+    # The last duration is rounded differently when converted to microseconds in one multiplication
+    durations = [1, 1.9, 2.5, 36.25, 9734.602747664127]
+    scales = ["months", "years", "weeks", "hours", "days"]
+    operations = ["+", "-", "-", "+", "-"]
+    results = Calculations.calculate_offsets(origins, durations, scales, operations)
+    for i, origin in enumerate(origins):
+        expected = origin + Calculations.calculate_delta(scales[i], durations[i], operations[i])
+        assert results[i].astype(datetime) == expected